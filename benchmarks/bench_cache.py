@@ -0,0 +1,69 @@
+"""Час завантаження та запису локального кешу папок (msgpack + zstd) проти JSON.
+
+Запуск: python benchmarks/bench_cache.py --folders 100 1000 10000 --cells 2
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snapshot_cache import SnapshotCache
+
+
+def make_folders(folders, cells, seed):
+    rng = random.Random(seed)
+    return {
+        f"folder_{i:05d}": [
+            {'name': f"{rng.uniform(100, 999):.3f}", 'timestamp': rng.uniform(1.7e9, 1.8e9), 'status': 'active'}
+            for _ in range(cells)
+        ]
+        for i in range(folders)
+    }
+
+
+def best_of(repeat, func):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--folders', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--cells', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    print(f"{'папок':>7} {'кеш, КБ':>8} {'запис, мс':>10} {'читання, мс':>12} {'JSON, КБ':>9} {'читання JSON, мс':>17}")
+    for count in args.folders:
+        folders = make_folders(count, args.cells, args.seed)
+        cache = SnapshotCache(os.path.join(workdir, f"cache_{count}.bin"))
+        write_time = best_of(args.repeat, lambda: cache._write(folders))
+        read_time = best_of(args.repeat, cache.load)
+        assert cache.load()[0] == folders
+
+        json_path = os.path.join(workdir, f"cache_{count}.json")
+        with open(json_path, 'w') as json_file:
+            json.dump(folders, json_file)
+
+        def load_json():
+            with open(json_path) as json_file:
+                return json.load(json_file)
+
+        json_time = best_of(args.repeat, load_json)
+        print(f"{count:>7} {os.path.getsize(cache.path) / 1024:>8.1f} {write_time * 1000:>10.2f} "
+              f"{read_time * 1000:>12.2f} {os.path.getsize(json_path) / 1024:>9.1f} {json_time * 1000:>17.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Профіль імпорту при запуску (python -X importtime) до показу вікна.
+
+Імпортує main_window в окремому процесі кілька разів, друкує медіанний час
+імпорту і найважчі модулі. Важкі SDK (firebase_admin, grpc, google.cloud,
+google.auth) мають імпортуватися лише при автентифікації; з --check скрипт
+завершується з кодом 1, якщо вони потрапили у старт або перевищено --budget.
+
+Запуск: python benchmarks/bench_importtime.py --runs 5 --top 15 --check --budget 300
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_PREFIXES = ('firebase_admin', 'grpc', 'google.cloud', 'google.auth', 'google.api_core', 'pyperclip')
+
+
+def profile(module):
+    """{модуль: (власний час, сумарний час) у мкс} для одного запуску"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True)
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='main_window')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--check', action='store_true', help="код 1 при регресії")
+    parser.add_argument('--budget', type=float, help="межа медіанного часу імпорту, мс")
+    args = parser.parse_args()
+
+    runs = [profile(args.module) for _ in range(args.runs)]
+    totals = [run[args.module][1] / 1000 for run in runs]
+    total = statistics.median(totals)
+
+    modules = runs[-1].keys()
+    cumulative = {name: statistics.median(run[name][1] for run in runs if name in run) for name in modules}
+    own = {name: statistics.median(run[name][0] for run in runs if name in run) for name in modules}
+
+    print(f"Імпорт {args.module}: медіана {total:.1f} мс (мін {min(totals):.1f}, макс {max(totals):.1f}), "
+          f"модулів: {len(modules)}")
+    print(f"\n{'сумарно, мс':>12} {'власний, мс':>12}  модуль")
+    for name in sorted(cumulative, key=cumulative.get, reverse=True)[:args.top]:
+        print(f"{cumulative[name] / 1000:>12.1f} {own[name] / 1000:>12.1f}  {name}")
+
+    heavy = sorted(name for name in modules if name.startswith(HEAVY_PREFIXES))
+    if heavy:
+        print(f"\nВажкі модулі у старті: {', '.join(heavy)}")
+
+    if args.check:
+        failed = bool(heavy) or (args.budget is not None and total > args.budget)
+        print("\nПеревірка:", "РЕГРЕСІЯ" if failed else "OK")
+        sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
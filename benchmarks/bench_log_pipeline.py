@@ -0,0 +1,103 @@
+"""Вартість запису в журнал для потоку-виробника: log_pipeline проти попередніх шляхів.
+
+Попередні шляхи: print кожного рядка (LogWindow.log) та queue.Queue.put_nowait
+з форматуванням часу (QueryLogWriter.write).
+
+Запуск: python benchmarks/bench_log_pipeline.py --records 200000 --threads 1 4
+"""
+import argparse
+import io
+import os
+import queue
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_pipeline import LogPipeline
+
+
+def old_print(message, level):
+    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] [{level}] {message}")
+
+
+def make_old_queue():
+    lines = queue.Queue(maxsize=10000)
+
+    def write(message, level):
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+        try:
+            lines.put_nowait(f"[{timestamp}] {message}\n")
+        except queue.Full:
+            pass
+
+    def drain(stop):
+        while not stop.is_set() or not lines.empty():
+            try:
+                lines.get(timeout=0.05)
+            except queue.Empty:
+                pass
+
+    return write, drain
+
+
+def make_pipeline():
+    pipeline = LogPipeline(flush_interval=0.05, console=False)
+    received = []
+    pipeline.add_sink(lambda records: received.append(len(records)))
+    return pipeline.emit, pipeline
+
+
+def run(emit, records, threads):
+    """Середній час одного виклику emit у кожному потоці-виробнику, нс"""
+    per_thread = records // threads
+    costs = []
+    barrier = threading.Barrier(threads)
+
+    def produce():
+        barrier.wait()
+        start = time.perf_counter()
+        for i in range(per_thread):
+            emit(f"Оновлено папку folder_{i % 1000:05d}", "INFO")
+        costs.append((time.perf_counter() - start) / per_thread * 1e9)
+
+    workers = [threading.Thread(target=produce) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return max(costs)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--records', type=int, default=200000)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4])
+    args = parser.parse_args()
+
+    print(f"{'шлях':<22} {'потоків':>8} {'нс/запис':>10}")
+    for threads in args.threads:
+        with redirect_stdout(io.StringIO()):
+            cost = run(old_print, args.records, threads)
+        print(f"{'print (LogWindow)':<22} {threads:>8} {cost:>10.0f}")
+
+        write, drain = make_old_queue()
+        stop = threading.Event()
+        consumer = threading.Thread(target=drain, args=(stop,))
+        consumer.start()
+        cost = run(write, args.records, threads)
+        stop.set()
+        consumer.join()
+        print(f"{'Queue (QueryLogWriter)':<22} {threads:>8} {cost:>10.0f}")
+
+        emit, pipeline = make_pipeline()
+        cost = run(emit, args.records, threads)
+        pipeline.close()
+        print(f"{'log_pipeline.emit':<22} {threads:>8} {cost:>10.0f}  відкинуто: {pipeline.dropped}")
+
+
+if __name__ == '__main__':
+    main()
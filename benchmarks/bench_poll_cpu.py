@@ -0,0 +1,77 @@
+"""CPU та пікова пам'ять обробки одного опитування: до і після відмови від json.dumps.
+
+"До": json.dumps усього знімка для підрахунку байт + _analyze_structure щоразу.
+"Після": розмір береться з HTTP відповіді, структура - лише при зміні форми.
+
+Запуск: python benchmarks/bench_poll_cpu.py --folders 1000 --entries 50 --polls 20
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_manager import ConfigManager
+from fake_rtdb import generate_tree
+from delta_engine import DeltaEngine
+from firebase_manager import FirebaseManager
+from folder_window import FolderFrame
+
+
+def process(data):
+    # Повна обробка знімка, як при першому завантаженні
+    engine = DeltaEngine(FolderFrame.NUM_CELLS)
+    engine.update_views(engine.apply_snapshot(data.get('frequency')))
+
+
+def poll_before(manager, data):
+    data_size = len(json.dumps(data)) if data else 0
+    details = f"{data_size} {manager._analyze_structure(data)}"
+    process(data)
+    return details
+
+
+def poll_after(manager, data):
+    details = manager._structure_details(data)
+    process(data)
+    return details
+
+
+def measure(poll, manager, data, polls):
+    start = time.process_time()
+    for _ in range(polls):
+        poll(manager, data)
+    cpu = (time.process_time() - start) / polls
+
+    tracemalloc.start()
+    poll(manager, data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--folders', type=int, default=1000)
+    parser.add_argument('--entries', type=int, default=50)
+    parser.add_argument('--unrelated', type=int, default=20000)
+    parser.add_argument('--polls', type=int, default=20)
+    args = parser.parse_args()
+
+    # Дані у тому вигляді, в якому їх повертає firebase_admin після json.loads
+    data = json.loads(json.dumps(generate_tree(args.folders, args.entries, args.unrelated)))
+    manager = FirebaseManager(ConfigManager())
+    manager.log_file = os.devnull
+    manager._log("BENCH", "init")
+    manager._structure_details(data)  # перше опитування завжди логує структуру
+
+    for name, poll in (('до', poll_before), ('після', poll_after)):
+        cpu, peak = measure(poll, manager, data, args.polls)
+        print(f"{name:<6} CPU {cpu * 1000:8.1f} мс/опитування   пік пам'яті {peak / 1024:10.1f} КБ")
+
+
+if __name__ == '__main__':
+    main()
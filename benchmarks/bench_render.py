@@ -0,0 +1,97 @@
+"""Вартість оновлення вікна папок: повний перерендер проти диференційного.
+
+"До": update_frequencies для всіх папок і повна перестановка сітки
+(grid_forget + grid усіх рамок, update_idletasks) на кожне оновлення.
+"Після": FolderManager.apply_changes лише зі зміненими папками
+(рамки оновлюються тільки для видимих папок віртуалізованої сітки).
+За замовчуванням замість Tk використовується заглушка, що рахує виклики
+методів віджетів (працює без дисплея); --tk - справжній Tk (потрібен дисплей або Xvfb).
+
+Запуск: python benchmarks/bench_render.py --folders 500 --change-rate 0.01 --ticks 200
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tk_stub
+
+def render_before(frames, folders_data, root):
+    # Колишній update_all_folders: оновлення і перестановка всіх рамок
+    for folder_name, folder_data in folders_data.items():
+        frames[folder_name].update_frequencies(folder_data)
+    frames_per_row = max(1, 1200 // next(iter(frames.values())).main_frame.winfo_reqwidth())
+    for frame in frames.values():
+        frame.main_frame.pack_forget()
+        frame.main_frame.grid_forget()
+    for i, frame in enumerate(frames.values()):
+        frame.main_frame.grid(row=i // frames_per_row, column=i % frames_per_row, sticky='nw', padx=5, pady=5)
+    root.update_idletasks()
+
+
+def make_entry(rng, now):
+    return {'frequency': f"{rng.uniform(100, 999):.3f}", 'name': '', 'timestamp': now}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--folders', type=int, default=500)
+    parser.add_argument('--change-rate', type=float, default=0.01)
+    parser.add_argument('--ticks', type=int, default=200)
+    parser.add_argument('--tk', action='store_true', help="справжній Tk замість заглушки")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    if not args.tk:
+        tk_stub.install()
+    import tkinter as tk
+    from folder_window import FolderFrame, FolderManager
+
+    root = tk.Tk()
+    main_app = types.SimpleNamespace(root=root, config_manager=types.SimpleNamespace(folder_cells={}))
+    rng = random.Random(args.seed)
+    changed_per_tick = max(1, int(args.folders * args.change_rate))
+
+    print(f"папок: {args.folders}, змінених за оновлення: {changed_per_tick}")
+    print(f"{'варіант':>8} {'мс/оновлення':>13} {'викликів Tk/оновлення':>22}")
+    for variant in ('before', 'after'):
+        folders = {f"folder_{i:05d}": [make_entry(rng, 1.7e9), make_entry(rng, 1.7e9)] for i in range(args.folders)}
+        if variant == 'before':
+            frames = {name: FolderFrame(root, name) for name in folders}
+            render_before(frames, folders, root)
+        else:
+            manager = FolderManager(main_app)
+            manager.update_all_folders({'frequency': folders})
+            manager._render_viewport()
+        if args.tk:
+            root.update()
+
+        calls_before = tk_stub.STATS['calls']
+        start = time.perf_counter()
+        for tick in range(args.ticks):
+            changes = {}
+            for folder_name in rng.sample(sorted(folders), changed_per_tick):
+                folders[folder_name] = [make_entry(rng, 1.7e9 + tick + 1), folders[folder_name][0]]
+                changes[folder_name] = folders[folder_name]
+            if variant == 'before':
+                render_before(frames, folders, root)
+            else:
+                manager.apply_changes(changes)
+            if args.tk:
+                root.update()
+        elapsed = time.perf_counter() - start
+        calls = (tk_stub.STATS['calls'] - calls_before) / args.ticks
+        print(f"{variant:>8} {elapsed / args.ticks * 1000:>13.3f} {calls if not args.tk else float('nan'):>22.0f}")
+        if variant == 'before':
+            for frame in frames.values():
+                frame.destroy()
+        else:
+            manager.close_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Час запуску вікна: до першого показу вікна і до перших даних у папках.
+
+"sync": як раніше - автентифікація та перше завантаження в MainApp.__init__
+до mainloop. "async": вікно показується одразу, завантаження - у фоні
+(Monitor.preload). Кожен варіант запускається в окремому процесі з
+локальним fake_rtdb, що відповідає із затримкою --latency.
+
+Потрібен дисплей (Tk). Запуск: python benchmarks/bench_startup.py --latency 0.5 --runs 3
+"""
+import time
+
+T0 = time.perf_counter()
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def serve(folders, entries, latency):
+    from fake_rtdb import FakeRTDBHandler, FakeRTDBServer, generate_tree
+    import threading
+
+    class SlowHandler(FakeRTDBHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            super().do_GET()
+
+    server = FakeRTDBServer(('127.0.0.1', 0), generate_tree(folders, entries), handler=SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def child(variant, timeout):
+    from main_window import MainApp
+
+    class SyncApp(MainApp):
+        def _initialize_data(self):
+            if self.config_manager.read_config():
+                self.monitor.load_initial_data()
+
+    app = (SyncApp if variant == 'sync' else MainApp)()
+    times = {}
+
+    def on_map(event):
+        times.setdefault('first_window', time.perf_counter() - T0)
+
+    def check_data():
+        if app.folder_manager.frames:
+            times['first_data'] = time.perf_counter() - T0
+            app.root.after(0, app.on_closing)
+        elif time.perf_counter() - T0 > timeout:
+            app.root.after(0, app.on_closing)
+        else:
+            app.root.after(5, check_data)
+
+    app.root.bind('<Map>', on_map, add='+')
+    app.root.after(0, check_data)
+    app.run()
+    print('RESULT ' + json.dumps(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0.5, help="затримка відповіді сервера, с")
+    parser.add_argument('--folders', type=int, default=100)
+    parser.add_argument('--entries', type=int, default=20)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--child', choices=['sync', 'async'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.timeout)
+        return
+
+    server = serve(args.folders, args.entries, args.latency)
+    workdir = tempfile.mkdtemp()
+    with open(os.path.join(workdir, 'config.json'), 'w') as config_file:
+        json.dump({'json_file_path': '', 'firebase_url': server.url, 'transport': 'rest'}, config_file)
+
+    print(f"{'варіант':>8} {'перше вікно, мс':>16} {'перші дані, мс':>15}")
+    try:
+        for variant in ('sync', 'async'):
+            results = []
+            for _ in range(args.runs):
+                output = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), '--child', variant, '--timeout', str(args.timeout)],
+                    cwd=workdir, capture_output=True, text=True, check=True).stdout
+                line = next(line for line in output.splitlines() if line.startswith('RESULT '))
+                results.append(json.loads(line[len('RESULT '):]))
+            window = sorted(r.get('first_window', float('nan')) for r in results)[len(results) // 2]
+            data = sorted(r.get('first_data', float('nan')) for r in results)[len(results) // 2]
+            print(f"{variant:>8} {window * 1000:>16.0f} {data * 1000:>15.0f}")
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Порівняння опитування кореня бази та потоку подій SSE на локальному fake_rtdb.
+
+Запуск: python benchmarks/bench_stream_vs_poll.py --folders 200 --entries 50 --duration 20
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_manager import ConfigManager, DatabaseConfig
+from event_stream import EventStream
+from fake_rtdb import generate_tree, start_server
+from monitor_core import DatabaseWorker
+
+
+def make_worker():
+    return DatabaseWorker(DatabaseConfig(None, {}, ConfigManager()), '')
+
+
+def writer(server, folders, rate, stop):
+    """Додає нові записи у випадкові папки з частотою rate за секунду"""
+    rng = random.Random(1)
+    counter = 0
+    while not stop.wait(1 / rate):
+        folder = f"folder_{rng.randrange(folders):05d}"
+        counter += 1
+        server.database.set(['frequency', folder, f"new_{counter:06d}"], {
+            'name': f"{rng.uniform(100, 500):.3f}",
+            'timestamp': time.time(),
+            'status': 'active'
+        })
+
+
+def run_poll(server, duration, interval):
+    worker = make_worker()
+    latencies, total_bytes = [], 0
+    deadline = time.time() + duration
+    while time.time() < deadline:
+        with urllib.request.urlopen(server.url + '.json') as response:
+            body = response.read()
+        total_bytes += len(body)
+        first = not worker.engine.views
+        changes = worker.engine.apply_snapshot(json.loads(body).get('frequency'))
+        updates = worker.engine.update_views(changes)
+        now = time.time()
+        if not first:
+            for entries in updates.values():
+                if entries:
+                    latencies.append(now - entries[0]['timestamp'])
+        time.sleep(interval)
+    return total_bytes, latencies
+
+
+def run_stream(server, duration):
+    worker = make_worker()
+    stream = EventStream(server.url + 'frequency.json')
+    latencies = []
+
+    def consume():
+        try:
+            for event, path, data in stream.events():
+                updates = worker.engine.update_views(worker.engine.apply_event(event, path, data))
+                now = time.time()
+                if len(updates) > 1:
+                    continue  # початкове завантаження
+                for entries in updates.values():
+                    if entries:
+                        latencies.append(now - entries[0]['timestamp'])
+        except (OSError, ValueError):
+            pass
+
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+    time.sleep(duration)
+    stream.close()
+    thread.join(timeout=2)
+    return stream.bytes_read, latencies
+
+
+def report(name, total_bytes, latencies, duration):
+    if latencies:
+        latencies = sorted(latencies)
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+        latency = f"затримка avg {statistics.mean(latencies) * 1000:.1f} мс, p95 {p95 * 1000:.1f} мс"
+    else:
+        latency = "змін не виявлено"
+    print(f"{name:<8} {total_bytes:>12} байт  {total_bytes / duration / 1024:>10.1f} КБ/с  "
+          f"змін: {len(latencies):>4}  {latency}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--folders', type=int, default=200)
+    parser.add_argument('--entries', type=int, default=50)
+    parser.add_argument('--unrelated', type=int, default=2000)
+    parser.add_argument('--rate', type=float, default=2, help="записів за секунду")
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--interval', type=float, default=1)
+    args = parser.parse_args()
+
+    for name in ('poll', 'stream'):
+        server = start_server(generate_tree(args.folders, args.entries, args.unrelated))
+        stop = threading.Event()
+        threading.Thread(target=writer, args=(server, args.folders, args.rate, stop), daemon=True).start()
+        if name == 'poll':
+            total_bytes, latencies = run_poll(server, args.duration, args.interval)
+        else:
+            total_bytes, latencies = run_stream(server, args.duration)
+        stop.set()
+        server.stop()
+        report(name, total_bytes, latencies, args.duration)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""Набір бенчмарків обробки і відображення на синтетичному дереві Firebase.
+
+Для кожної точки масштабу (папок x записів x частка змінених папок) дерево
+будується fake_rtdb.generate_tree, а зміни між опитуваннями - MutationGenerator.
+Етапи одного опитування:
+  parse   - json.loads відповіді /frequency
+  detect  - DeltaEngine.apply_snapshot (пошук змінених записів)
+  views   - MonitorCore._folder_updates (TopK-вигляди змінених папок)
+  format  - Monitor._update_ui (підготовка даних для вікна)
+  render  - FolderManager.apply_changes (заглушка Tk або --tk)
+Окремо - перше повне завантаження (initial) і опитування без змін (idle).
+Результати пишуться в JSON; --compare попередній.json друкує співвідношення.
+
+Запуск: python benchmarks/bench_suite.py --folders 100 1000 10000 --output suite.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import tk_stub
+
+STAGES = ('parse', 'detect', 'views', 'format', 'render')
+
+
+class CapturingFolderManager:
+    """Приймає дані з Monitor._update_ui, щоб форматування міряти окремо від рендерингу"""
+
+    def __init__(self):
+        self.formatted = None
+
+    def apply_changes(self, folders_data):
+        self.formatted = folders_data
+
+    def close_all(self):
+        pass
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def summary(samples):
+    samples = sorted(samples)
+    return {
+        'mean': statistics.mean(samples),
+        'p50': samples[len(samples) // 2],
+        'p95': samples[max(0, int(len(samples) * 0.95) - 1)],
+        'max': samples[-1],
+    }
+
+
+def run_point(folders, entries, change_rate, ticks, seed):
+    import tkinter as tk
+    from config_manager import ConfigManager, DatabaseConfig
+    from fake_rtdb import FakeDatabase, MutationGenerator, generate_tree
+    from folder_window import FolderManager
+    from monitor import Monitor
+    from monitor_core import DatabaseWorker
+
+    root = tk.Tk()
+    capture = CapturingFolderManager()
+    main_app = types.SimpleNamespace(root=root, config_manager=types.SimpleNamespace(folder_cells={}))
+    manager = FolderManager(main_app)
+    main_app.folder_manager = capture
+    monitor = Monitor(main_app)
+    worker = DatabaseWorker(DatabaseConfig(None, {}, ConfigManager()), '')
+
+    tree = generate_tree(folders, entries, seed=seed)
+    database = FakeDatabase(tree)
+    generator = MutationGenerator(tree, seed=seed)
+    changed_folders = max(1, round(folders * change_rate))
+
+    def poll(body, render):
+        times = {}
+        frequency, times['parse'] = timed(json.loads, body)
+        changes, times['detect'] = timed(worker.engine.apply_snapshot, frequency)
+        updates, times['views'] = timed(monitor.core._folder_updates, worker, changes)
+        capture.formatted = None
+        _, times['format'] = timed(monitor._update_ui, updates)
+        _, times['render'] = timed(render, capture.formatted or {})
+        times['total'] = sum(times.values())
+        return times
+
+    def render_initial(formatted):
+        manager.update_all_folders({'frequency': formatted})
+        # Перший прохід вимірює рамку, другий заповнює видиму область
+        manager._render_viewport()
+        manager._render_viewport()
+
+    widgets_before = tk_stub.STATS['widgets']
+    initial = poll(database.get_json(['frequency']), render_initial)
+
+    tick_times, idle_times = [], []
+    for _ in range(ticks):
+        for parts, value in generator.mutations(changed_folders):
+            database.set(parts, value)
+        tick_times.append(poll(database.get_json(['frequency']), manager.apply_changes))
+        idle_times.append(poll(database.get_json(['frequency']), manager.apply_changes))
+
+    result = {
+        'folders': folders,
+        'entries': entries,
+        'change_rate': change_rate,
+        'changed_folders': changed_folders,
+        'ticks': ticks,
+        'payload_bytes': len(database.get_json(['frequency'])),
+        'widgets': tk_stub.STATS['widgets'] - widgets_before,
+        'initial': initial,
+        'tick': {stage: summary([t[stage] for t in tick_times]) for stage in STAGES + ('total',)},
+        'idle': {stage: summary([t[stage] for t in idle_times]) for stage in STAGES + ('total',)},
+    }
+    manager.close_all()
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_result(result):
+    print(f"\nпапок: {result['folders']}, записів: {result['entries']}, змінених папок: "
+          f"{result['changed_folders']}, відповідь: {result['payload_bytes'] / 1024:.0f} КБ, "
+          f"віджетів: {result['widgets']}")
+    print(f"{'етап':<8} {'initial, мс':>12} {'tick mean':>10} {'tick p95':>10} {'idle mean':>10}")
+    for stage in STAGES + ('total',):
+        print(f"{stage:<8} {result['initial'][stage]:>12.2f} {result['tick'][stage]['mean']:>10.2f} "
+              f"{result['tick'][stage]['p95']:>10.2f} {result['idle'][stage]['mean']:>10.2f}")
+
+
+def compare(previous_path, report):
+    with open(previous_path, encoding='utf-8') as f:
+        previous = json.load(f)
+    old_runs = {(r['folders'], r['entries'], r['change_rate']): r for r in previous['results']}
+    print(f"\nПорівняння з {previous_path} ({previous['meta'].get('revision')}), tick mean: нове / старе")
+    for result in report['results']:
+        old = old_runs.get((result['folders'], result['entries'], result['change_rate']))
+        if old is None:
+            continue
+        ratios = ', '.join(
+            f"{stage} {result['tick'][stage]['mean'] / old['tick'][stage]['mean']:.2f}x"
+            for stage in STAGES + ('total',) if old['tick'][stage]['mean']
+        )
+        print(f"папок {result['folders']:>6}: {ratios}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--folders', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--entries', type=int, default=20)
+    parser.add_argument('--change-rate', type=float, default=0.01, help="частка папок, змінених між опитуваннями")
+    parser.add_argument('--ticks', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--tk', action='store_true', help="справжній Tk замість заглушки (потрібен дисплей або Xvfb)")
+    parser.add_argument('--output', default=f"bench_suite_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    parser.add_argument('--compare', help="JSON попереднього запуску")
+    args = parser.parse_args()
+
+    if not args.tk:
+        tk_stub.install()
+
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'tk': 'real' if args.tk else 'stub',
+            'args': vars(args),
+        },
+        'results': [],
+    }
+    for folders in args.folders:
+        result = run_point(folders, args.entries, args.change_rate, args.ticks, args.seed)
+        report['results'].append(result)
+        print_result(result)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nРезультати: {args.output}")
+
+    if args.compare:
+        compare(args.compare, report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Вартість оновлення вигляду папки: повне сортування проти індексу TopK.
+
+"До": після кожної зміни записи папки сортуються за timestamp і береться [:K].
+"Після": зміна застосовується до TopK (купи з лінивим видаленням), вигляд - top().
+Зміни: нові записи (70%), оновлення timestamp (20%), видалення (10%).
+
+Запуск: python benchmarks/bench_top_k.py --entries 10000 50000 --updates 2000 --k 2
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from top_k import TopK
+
+
+def make_operations(entries, updates, seed):
+    rng = random.Random(seed)
+    ids = [f"e{i}" for i in range(entries)]
+    initial = {entry_id: {'name': entry_id, 'timestamp': rng.uniform(0, 1e6)} for entry_id in ids}
+    operations = []
+    next_id = entries
+    for _ in range(updates):
+        roll = rng.random()
+        if roll < 0.7:
+            entry_id = f"e{next_id}"
+            next_id += 1
+            ids.append(entry_id)
+            operations.append(('set', entry_id, {'name': entry_id, 'timestamp': 1e6 + next_id}))
+        elif roll < 0.9:
+            entry_id = rng.choice(ids)
+            operations.append(('set', entry_id, {'name': entry_id, 'timestamp': rng.uniform(0, 2e6)}))
+        else:
+            entry_id = ids.pop(rng.randrange(len(ids)))
+            operations.append(('remove', entry_id, None))
+    return initial, operations
+
+
+def run_sort(initial, operations, k):
+    entries = dict(initial)
+    start = time.perf_counter()
+    for op, entry_id, entry in operations:
+        if op == 'set':
+            entries[entry_id] = entry
+        else:
+            entries.pop(entry_id, None)
+        view = sorted(entries.values(), key=lambda x: x.get('timestamp', 0), reverse=True)[:k]
+    return time.perf_counter() - start, view
+
+
+def run_top_k(initial, operations, k):
+    index = TopK(k)
+    for entry_id, entry in initial.items():
+        index.set(entry_id, entry['timestamp'], entry)
+    start = time.perf_counter()
+    for op, entry_id, entry in operations:
+        if op == 'set':
+            index.set(entry_id, entry['timestamp'], entry)
+        else:
+            index.remove(entry_id)
+        view = index.top()
+    return time.perf_counter() - start, view
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, nargs='+', default=[10000, 50000])
+    parser.add_argument('--updates', type=int, default=2000)
+    parser.add_argument('--k', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'записів':>8} {'сортування, мкс/зміну':>22} {'TopK, мкс/зміну':>16} {'прискорення':>12}")
+    for entries in args.entries:
+        initial, operations = make_operations(entries, args.updates, args.seed)
+        sort_time, sort_view = run_sort(initial, operations, args.k)
+        heap_time, heap_view = run_top_k(initial, operations, args.k)
+        assert sort_view == heap_view, "вигляди не збігаються"
+        print(f"{entries:>8} {sort_time / args.updates * 1e6:>22.1f} "
+              f"{heap_time / args.updates * 1e6:>16.2f} {sort_time / heap_time:>11.0f}x")
+
+
+if __name__ == '__main__':
+    main()
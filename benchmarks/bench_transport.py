@@ -0,0 +1,60 @@
+"""Порівняння транспорту REST: нове з'єднання на кожен запит vs пул keep-alive, з gzip і без.
+
+Запуск: python benchmarks/bench_transport.py --folders 200 --entries 20 --requests 200
+"""
+import argparse
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_rtdb import generate_tree, start_server
+from transport import RestTransport
+
+VARIANTS = (
+    ("без keep-alive", {'pool_size': 0, 'compress': False}),
+    ("keep-alive", {'pool_size': 4, 'compress': False}),
+    ("keep-alive+gzip", {'pool_size': 4, 'compress': True}),
+)
+
+
+def run(transport, path, requests):
+    timings = {'dns': [], 'connect': [], 'ttfb': [], 'body': [], 'total': []}
+    total_bytes = 0
+    for _ in range(requests):
+        response = transport.get(path)
+        total_bytes += response.nbytes
+        for stage in timings:
+            timings[stage].append(response.timings.get(stage, 0))
+    return total_bytes, timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--folders', type=int, default=200)
+    parser.add_argument('--entries', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--path', default='frequency')
+    parser.add_argument('--url', help="існуючий сервер замість локального fake_rtdb")
+    args = parser.parse_args()
+
+    server = None if args.url else start_server(generate_tree(args.folders, args.entries))
+    url = args.url or server.url
+
+    for name, options in VARIANTS:
+        transport = RestTransport(url, **options)
+        total_bytes, timings = run(transport, args.path, args.requests)
+        transport.close()
+        stages = '  '.join(
+            f"{stage} {statistics.mean(values) * 1000:6.2f}"
+            for stage, values in timings.items()
+        )
+        print(f"{name:<16} {total_bytes / args.requests / 1024:8.1f} КБ/запит   мс: {stages}")
+
+    if server:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
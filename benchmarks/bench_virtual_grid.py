@@ -0,0 +1,117 @@
+"""Пам'ять і затримка прокручування сітки папок на 10k папок.
+
+"Усі рамки": FolderFrame для кожної папки (як до віртуалізації).
+"Віртуальна": FolderManager створює рамки лише для видимих рядків і буфера.
+Пам'ять - tracemalloc (об'єкти Python) і кількість віджетів; прокручування -
+yview_moveto у випадкову позицію та перерахунок видимої області.
+За замовчуванням - заглушка Tk без дисплея; --tk - справжній Tk.
+
+Запуск: python benchmarks/bench_virtual_grid.py --folders 10000 --scrolls 200
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tk_stub
+
+
+def make_folders(count, rng):
+    return {
+        f"folder_{i:05d}": [
+            {'frequency': f"{rng.uniform(100, 999):.3f}", 'name': '', 'timestamp': 1.7e9 + rng.random()}
+            for _ in range(2)
+        ]
+        for i in range(count)
+    }
+
+
+def count_widgets(root, use_tk):
+    if not use_tk:
+        return tk_stub.STATS['widgets']
+    stack, total = [root], 0
+    while stack:
+        widget = stack.pop()
+        children = widget.winfo_children()
+        total += len(children)
+        stack.extend(children)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--folders', type=int, default=10000)
+    parser.add_argument('--scrolls', type=int, default=200)
+    parser.add_argument('--tk', action='store_true', help="справжній Tk замість заглушки")
+    parser.add_argument('--skip-full', action='store_true', help="без варіанту з рамкою для кожної папки")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    if not args.tk:
+        tk_stub.install()
+    import tkinter as tk
+    from folder_window import FolderFrame, FolderManager
+
+    rng = random.Random(args.seed)
+    folders = make_folders(args.folders, rng)
+    print(f"папок: {args.folders}")
+    print(f"{'варіант':>10} {'віджетів':>9} {'пам.Python, МБ':>15} {'створення, с':>13} "
+          f"{'прокрутка p50, мс':>18} {'p95, мс':>8}")
+
+    for variant in ('full', 'virtual'):
+        if variant == 'full' and args.skip_full:
+            continue
+        root = tk.Tk()
+        widgets_before = count_widgets(root, args.tk)
+        tracemalloc.start()
+        start = time.perf_counter()
+        if variant == 'full':
+            frames = []
+            for name, data in folders.items():
+                frame = FolderFrame(root, name)
+                frame.main_frame.grid(row=len(frames) // 6, column=len(frames) % 6)
+                frame.update_frequencies(data)
+                frames.append(frame)
+            scroll = None
+        else:
+            main_app = types.SimpleNamespace(root=root, config_manager=types.SimpleNamespace(folder_cells={}))
+            manager = FolderManager(main_app)
+            manager.last_width = 1200
+            manager.update_all_folders({'frequency': folders})
+            manager._render_viewport()
+            manager._render_viewport()
+            scroll = manager
+        if args.tk:
+            root.update()
+        created = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+        tracemalloc.stop()
+        widgets = count_widgets(root, args.tk) - widgets_before
+
+        latencies = []
+        if scroll is not None:
+            for _ in range(args.scrolls):
+                start = time.perf_counter()
+                scroll.canvas.yview_moveto(rng.random())
+                scroll._render_viewport()
+                if args.tk:
+                    root.update()
+                latencies.append(time.perf_counter() - start)
+        if latencies:
+            latencies.sort()
+            p50 = f"{statistics.median(latencies) * 1000:.2f}"
+            p95 = f"{latencies[int(len(latencies) * 0.95) - 1] * 1000:.2f}"
+        else:
+            p50 = p95 = "-"
+        print(f"{variant:>10} {widgets:>9} {memory:>15.1f} {created:>13.2f} {p50:>18} {p95:>8}")
+        root.destroy()
+
+
+if __name__ == '__main__':
+    main()
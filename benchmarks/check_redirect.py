@@ -0,0 +1,54 @@
+"""Перевірка перенаправлень (307) REST транспорту і потоку подій через fake_rtdb.
+
+Location у Firebase - повна адреса запиту з параметрами й токеном; після
+перенаправлення запити мають іти на новий вузол з тим самим шляхом бази.
+Код виходу 1, якщо дані після перенаправлення не збігаються.
+
+Запуск: python benchmarks/check_redirect.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_stream import EventStream
+from fake_rtdb import generate_tree, start_redirect_server, start_server
+from transport import RestTransport
+
+
+def check(name, ok, details=""):
+    print(f"{'OK  ' if ok else 'FAIL'} {name}{': ' + details if details and not ok else ''}")
+    return ok
+
+
+def main():
+    tree = generate_tree(5, 3)
+    server = start_server(tree)
+    redirect = start_redirect_server(server.url)
+    results = []
+    try:
+        transport = RestTransport(redirect.url, token_provider=lambda: 'token')
+        expected = {folder_name: True for folder_name in tree['frequency']}
+        first = transport.get('frequency', shallow=True)
+        results.append(check("shallow запит з перенаправленням", first.data == expected, repr(first.data)))
+        second = transport.get('frequency/folder_00001', etag=True)
+        results.append(check("наступний запит на новий вузол", second.data == tree['frequency']['folder_00001'],
+                             repr(second.data)))
+        unchanged = transport.get('frequency/folder_00001', etag=second.etag)
+        results.append(check("умовний запит (304)", not unchanged.changed))
+        results.append(check("перенаправлено лише перший запит", redirect.redirects == 1, str(redirect.redirects)))
+        transport.close()
+
+        stream = EventStream(f"{redirect.url}frequency.json", params={'access_token': 'token'})
+        event, path, data = next(stream.events())
+        stream.close()
+        results.append(check("потік подій з перенаправленням",
+                             (event, path, data) == ('put', '/', tree['frequency']), f"{event} {path} {data!r}"[:200]))
+    finally:
+        redirect.stop()
+        server.stop()
+    return 0 if all(results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
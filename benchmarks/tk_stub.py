@@ -0,0 +1,83 @@
+"""Заглушка tkinter для бенчмарків вікна без дисплея.
+
+Віджети лише рахують виклики методів (STATS['calls']) і створені віджети
+(STATS['widgets']); Canvas пам'ятає область прокрутки і позицію перегляду,
+щоб віртуалізована сітка FolderManager могла рахувати видимі рядки.
+"""
+import sys
+import types
+
+STATS = {'calls': 0, 'widgets': 0}
+
+
+class Widget:
+    def __init__(self, *args, **kwargs):
+        STATS['calls'] += 1
+        STATS['widgets'] += 1
+
+    def winfo_reqwidth(self):
+        return 170
+
+    def winfo_reqheight(self):
+        return 120
+
+    def winfo_width(self):
+        return 1200
+
+    def winfo_height(self):
+        return 800
+
+    def destroy(self):
+        STATS['calls'] += 1
+        STATS['widgets'] -= 1
+
+    def __getattr__(self, name):
+        def method(*args, **kwargs):
+            STATS['calls'] += 1
+        return method
+
+
+class Canvas(Widget):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scroll_height = 0
+        self.top = 0
+        self._items = 0
+
+    def config(self, scrollregion=None, **kwargs):
+        STATS['calls'] += 1
+        if scrollregion:
+            self.scroll_height = scrollregion[3]
+
+    configure = config
+
+    def create_window(self, *args, **kwargs):
+        STATS['calls'] += 1
+        self._items += 1
+        return self._items
+
+    def yview_moveto(self, fraction):
+        STATS['calls'] += 1
+        self.top = max(0, min(fraction * self.scroll_height, self.scroll_height - self.winfo_height()))
+
+    def canvasy(self, y):
+        return self.top + y
+
+    def bbox(self, *args):
+        return (0, 0, 1, 1)
+
+
+def install():
+    stub = types.ModuleType('tkinter')
+    for name in ('Tk', 'Frame', 'Label', 'Scrollbar'):
+        setattr(stub, name, Widget)
+    stub.Canvas = Canvas
+    for name in ('BOTH', 'GROOVE', 'LEFT', 'RAISED', 'X'):
+        setattr(stub, name, name.lower())
+    stub.TclError = type('TclError', (Exception,), {})
+    # Діалоги (config_manager, firebase_manager) у бенчмарках нічого не показують
+    messagebox = types.ModuleType('tkinter.messagebox')
+    messagebox.showerror = messagebox.showinfo = messagebox.showwarning = lambda *args, **kwargs: None
+    stub.messagebox = messagebox
+    sys.modules['tkinter'] = stub
+    sys.modules['tkinter.messagebox'] = messagebox
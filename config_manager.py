@@ -1,45 +1,153 @@
 import os
 import json
-import tkinter.messagebox as messagebox
+
+# Необов'язкові параметри config.json та значення за замовчуванням
+OPTIONS = {
+    'mode': "poll",  # poll - опитування, stream - потік подій SSE
+    'query_plan': "frequency",  # root | frequency | limit (останні N записів кожної папки)
+    'change_detection': "etag",  # etag | shallow (умовний GET кожної папки, 1 + N запитів) | none
+    'log_level': "INFO",  # DEBUG | INFO | WARNING | ERROR
+    'log_max_bytes': 5 * 1024 * 1024,
+    'log_backup_count': 3,
+    'transport': "admin",  # admin - firebase_admin.db, rest - пул keep-alive з'єднань з gzip
+    'pool_size': 4,
+    'connect_timeout': 10,
+    'read_timeout': 30,
+    'max_workers': 8,  # потоки спільного пулу опитування баз
+    'poll_interval': 1,  # секунди між опитуваннями, поки дані змінюються
+    'poll_max_interval': 30,  # межа уповільнення опитування без змін
+    'poll_idle_factor': 1.5,
+    'error_backoff': 2,  # перша затримка після помилки, далі подвоюється
+    'error_backoff_max': 300,
+    'refresh_after_errors': 3,  # помилок поспіль до перепідключення бази
+    'stale_after': 300,  # секунд без успішного опитування до перепідключення бази
+    'cache_file': "snapshot_cache.bin",  # локальний кеш папок для швидкого запуску ("" - вимкнено)
+    'folder_cells': {},  # папка (з префіксом бази) -> кількість відображуваних записів
+    'metrics_port': 0,  # порт HTTP сторінки метрик Prometheus (/metrics), 0 - вимкнено
+    'metrics_host': "127.0.0.1",  # "0.0.0.0" - доступ для збору метрик з інших машин
+    'profile': False,  # режим профілювання (також змінна середовища FIREBASE_MONITOR_PROFILE=1)
+    'profile_dir': "profiles",
+    'profile_interval': 60,  # секунди між записами профілів і знімків пам'яті
+}
+
+# Параметри, які можна перевизначити для окремої бази у списку "databases"
+DATABASE_OPTIONS = ('mode', 'query_plan', 'change_detection', 'transport',
+                    'pool_size', 'connect_timeout', 'read_timeout',
+                    'poll_interval', 'poll_max_interval')
+
+
+class DatabaseConfig:
+    """Налаштування однієї бази; не вказані для бази параметри беруться із загальних"""
+
+    def __init__(self, name, entry, defaults):
+        self.name = name
+        self.json_file = entry.get('json_file_path', defaults.json_file)
+        self.firebase_url = entry.get('firebase_url', defaults.firebase_url)
+        for option in OPTIONS:
+            value = entry.get(option, getattr(defaults, option)) if option in DATABASE_OPTIONS else getattr(defaults, option)
+            setattr(self, option, value)
+
+    def is_configured(self):
+        # Транспорт rest без ключа - локальний сервер (fake_rtdb) або емулятор
+        return bool(self.firebase_url and (self.json_file or self.transport == 'rest'))
+
+
+def _show_error(message):
+    import tkinter.messagebox as messagebox
+    messagebox.showerror("Помилка", message)
+
 
 class ConfigManager:
-    def __init__(self):
+    def __init__(self, path='config.json', on_error=None):
+        self.path = path
+        self.on_error = on_error or _show_error  # Показ помилок читання/запису (діалог або журнал)
         self.json_file = ""
         self.firebase_url = ""
+        for option, default in OPTIONS.items():
+            setattr(self, option, default)
+        self.databases = []
+        self._database_entries = []
 
     def read_config(self):
         try:
-            if not os.path.exists('config.json'):
+            if not os.path.exists(self.path):
                 return False
 
-            with open('config.json', 'r') as config_file:
+            with open(self.path, 'r') as config_file:
                 config_data = json.load(config_file)
                 self.json_file = config_data.get('json_file_path', "")
                 self.firebase_url = config_data.get('firebase_url', "")
+                for option, default in OPTIONS.items():
+                    setattr(self, option, config_data.get(option, default))
+                self.folder_cells = self._valid_folder_cells(self.folder_cells)
+                self._database_entries = config_data.get('databases') or []
+                self.databases = self._build_databases()
 
-                if not all([self.json_file, self.firebase_url]):
+                if not self.is_configured():
                     return False
 
             return True
         except Exception as e:
-            messagebox.showerror("Помилка", f"Помилка при читанні конфігураційного файлу: {e}")
+            self.on_error(f"Помилка при читанні конфігураційного файлу: {e}")
             return False
 
+    def _valid_folder_cells(self, folder_cells):
+        """folder_cells без некоректних значень: кількість записів - ціле число від 1"""
+        if not isinstance(folder_cells, dict):
+            self.on_error("folder_cells має бути об'єктом {папка: кількість записів}, параметр пропущено")
+            return {}
+        valid = {
+            folder_name: cells for folder_name, cells in folder_cells.items()
+            if isinstance(cells, int) and not isinstance(cells, bool) and cells >= 1
+        }
+        if len(valid) != len(folder_cells):
+            invalid = ', '.join(f"{name}: {folder_cells[name]!r}" for name in folder_cells if name not in valid)
+            self.on_error(f"Пропущено folder_cells з некоректною кількістю записів (потрібно ціле число від 1): {invalid}")
+        return valid
+
+    @property
+    def has_database_list(self):
+        """Бази задано списком "databases": папки у вікні мають префікс назви бази"""
+        return bool(self._database_entries)
+
+    def _build_databases(self):
+        """Список баз з "databases"; без нього - одна база з json_file_path / firebase_url"""
+        if not self._database_entries:
+            return [DatabaseConfig(None, {}, self)]
+        databases = [
+            DatabaseConfig(entry.get('name') or f"db{i + 1}", entry, self)
+            for i, entry in enumerate(self._database_entries)
+        ]
+        # Назва - префікс папок, ключ обробника і мітка метрик: дані однакових назв змішалися б
+        names = [database.name for database in databases]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"повторювані назви баз у \"databases\": {', '.join(duplicates)}")
+        return databases
+
     def save_config(self, json_file, firebase_url):
         config_data = {
             'json_file_path': json_file,
             'firebase_url': firebase_url
         }
+        # Лише змінені параметри: нові значення за замовчуванням діятимуть і для цього файлу
+        config_data.update({
+            option: getattr(self, option) for option, default in OPTIONS.items()
+            if getattr(self, option) != default
+        })
+        if self._database_entries:
+            config_data['databases'] = self._database_entries
         try:
-            with open('config.json', 'w') as config_file:
+            with open(self.path, 'w') as config_file:
                 json.dump(config_data, config_file, indent=4)
             self.json_file = json_file
             self.firebase_url = firebase_url
+            self.databases = self._build_databases()
             return True
         except Exception as e:
-            messagebox.showerror("Помилка", f"Помилка при збереженні конфігурації: {e}")
+            self.on_error(f"Помилка при збереженні конфігурації: {e}")
             return False
 
     def is_configured(self):
         """Check if configuration is valid and loaded"""
-        return bool(self.json_file and self.firebase_url)
\ No newline at end of file
+        return bool(self.databases) and all(database.is_configured() for database in self.databases)
@@ -0,0 +1,204 @@
+import time
+
+from top_k import TopK
+
+
+class FolderChanges:
+    """Зміни записів однієї папки: added / updated - {entry_id: запис}, removed - множина entry_id"""
+
+    __slots__ = ('added', 'updated', 'removed')
+
+    def __init__(self):
+        self.added = {}
+        self.updated = {}
+        self.removed = set()
+
+    def __bool__(self):
+        return bool(self.added or self.updated or self.removed)
+
+    def __repr__(self):
+        return f"FolderChanges(+{len(self.added)} ~{len(self.updated)} -{len(self.removed)})"
+
+
+class DeltaEngine:
+    """Інкрементальна обробка /frequency однієї бази.
+
+    Зберігає сирі записи (копію /frequency), оброблені записи в індексі TopK
+    кожної папки та відображувані top_k записів. Зміни застосовуються лише за зміненими шляхами:
+    з події потоку (apply_event) або з порівняння знімка (apply_snapshot), тому
+    вартість оновлення залежить від кількості змін, а не від розміру бази.
+    Отримані дані не копіюються: apply_event змінює дані попередніх подій на
+    місці, apply_snapshot лише читає знімок.
+    """
+
+    def __init__(self, top_k, folder_top_k=None):
+        self.top_k = top_k
+        self.folder_top_k = folder_top_k or {}  # папка -> K, якщо відрізняється від top_k
+        self.raw = {}  # папка -> {entry_id: сирий запис}
+        self.entries = {}  # папка -> TopK оброблених записів
+        self.views = {}  # папка -> top_k записів, новіші першими
+
+    def folder_k(self, folder_name):
+        return self.folder_top_k.get(folder_name, self.top_k)
+
+    def reset(self):
+        self.raw = {}
+        self.entries = {}
+        self.views = {}
+
+    @staticmethod
+    def process_entry(entry_data):
+        if not isinstance(entry_data, dict):
+            return None
+        return {
+            'name': entry_data.get('name', ''),
+            'timestamp': entry_data.get('timestamp', time.time()),
+            'status': entry_data.get('status', 'unknown')
+        }
+
+    def apply_snapshot(self, frequency):
+        """Порівняння повного знімка /frequency зі станом; повертає {папка: FolderChanges}"""
+        frequency = frequency if isinstance(frequency, dict) else {}
+        changes = {}
+
+        for folder_name in self.raw.keys() - frequency.keys():
+            self._replace_folder(folder_name, None, changes)
+
+        for folder_name, folder_data in frequency.items():
+            # Незмінені папки з кешу транспорту приходять тим самим об'єктом
+            if folder_data is not self.raw.get(folder_name):
+                self._replace_folder(folder_name, folder_data, changes)
+
+        return changes
+
+    def apply_event(self, event, path, data):
+        """Застосування події put/patch потоку (шлях відносно /frequency)"""
+        parts = [p for p in path.split('/') if p]
+        changes = {}
+
+        if event == 'put':
+            if parts:
+                self._apply_path(parts, data, changes)
+            else:
+                changes = self.apply_snapshot(data)
+        elif event == 'patch' and isinstance(data, dict):
+            for key, value in data.items():
+                full_path = parts + [p for p in key.split('/') if p]
+                if full_path:
+                    self._apply_path(full_path, value, changes)
+                else:
+                    changes.update(self.apply_snapshot(value))
+
+        return changes
+
+    def _apply_path(self, parts, value, changes):
+        folder_name = parts[0]
+        if len(parts) == 1:
+            self._replace_folder(folder_name, value, changes)
+            return
+
+        entry_id = parts[1]
+        raw_folder = self.raw.get(folder_name)
+        if len(parts) > 2:
+            old_entry = raw_folder.get(entry_id) if raw_folder else None
+            value = self._with_field(old_entry, parts[2:], value)
+
+        if value is None:
+            if raw_folder is None or entry_id not in raw_folder:
+                return
+            del raw_folder[entry_id]
+            if not raw_folder:
+                self._drop_folder(folder_name, changes)
+                return
+        else:
+            if raw_folder is None:
+                raw_folder = self.raw[folder_name] = {}
+                self._add_folder(folder_name, changes)
+            raw_folder[entry_id] = value
+
+        self._update_entry(folder_name, entry_id, value, changes)
+
+    @classmethod
+    def _with_field(cls, node, parts, value):
+        """Копія запису зі зміненим вкладеним полем (None - видалення)"""
+        node = dict(node) if isinstance(node, dict) else {}
+        key = parts[0]
+        if len(parts) > 1:
+            value = cls._with_field(node.get(key), parts[1:], value)
+        if value is None:
+            node.pop(key, None)
+        else:
+            node[key] = value
+        return node or None
+
+    def _replace_folder(self, folder_name, folder_data, changes):
+        new_raw = folder_data if isinstance(folder_data, dict) else {}
+        if not new_raw:
+            if folder_name in self.raw:
+                self._drop_folder(folder_name, changes)
+            return
+
+        old_raw = self.raw.get(folder_name)
+        if old_raw is None:
+            old_raw = {}
+            self._add_folder(folder_name, changes)
+
+        for entry_id in old_raw.keys() - new_raw.keys():
+            self._update_entry(folder_name, entry_id, None, changes)
+        for entry_id, entry_data in new_raw.items():
+            old_entry = old_raw.get(entry_id)
+            if old_entry is not entry_data and old_entry != entry_data:
+                self._update_entry(folder_name, entry_id, entry_data, changes)
+
+        self.raw[folder_name] = new_raw
+
+    def _add_folder(self, folder_name, changes):
+        self.entries[folder_name] = TopK(self.folder_k(folder_name))
+        self.views[folder_name] = None  # Ще не відображалась
+        self._changes(changes, folder_name)
+
+    def _update_entry(self, folder_name, entry_id, entry_data, changes):
+        entries = self.entries[folder_name]
+        processed = self.process_entry(entry_data)
+        previous = entries.get(entry_id)
+
+        if processed is None:
+            if previous is not None:
+                entries.remove(entry_id)
+                self._changes(changes, folder_name).removed.add(entry_id)
+        elif previous is None:
+            entries.set(entry_id, processed['timestamp'], processed)
+            self._changes(changes, folder_name).added[entry_id] = processed
+        elif previous != processed:
+            entries.set(entry_id, processed['timestamp'], processed)
+            self._changes(changes, folder_name).updated[entry_id] = processed
+
+    def _drop_folder(self, folder_name, changes):
+        entries = self.entries.get(folder_name)
+        if entries is not None:
+            self._changes(changes, folder_name).removed.update(entries.ids())
+        self.raw.pop(folder_name, None)
+        self.entries.pop(folder_name, None)
+        self.views.pop(folder_name, None)
+
+    @staticmethod
+    def _changes(changes, folder_name):
+        folder_changes = changes.get(folder_name)
+        if folder_changes is None:
+            folder_changes = changes[folder_name] = FolderChanges()
+        return folder_changes
+
+    def update_views(self, changes):
+        """Вигляди змінених папок з їх TopK; повертає {папка: новий вигляд або None}"""
+        updated = {}
+        for folder_name in changes:
+            entries = self.entries.get(folder_name)
+            if entries is None:
+                updated[folder_name] = None
+                continue
+
+            view = entries.top()
+            if view != self.views.get(folder_name):
+                self.views[folder_name] = view
+                updated[folder_name] = view
+        return updated
@@ -0,0 +1,124 @@
+import http.client
+import json
+import socket
+import threading
+from urllib.parse import urlsplit, urlunsplit, urlencode
+
+
+class StreamCancelled(Exception):
+    """Сервер закрив підписку (cancel / auth_revoked)"""
+
+    def __init__(self, event, message):
+        super().__init__(f"{event}: {message}")
+        self.event = event
+
+
+class EventStream:
+    """Клієнт Server-Sent Events для REST API Realtime Database.
+
+    Відкриває `GET <url>.json` з `Accept: text/event-stream` і повертає
+    події `put` / `patch` у вигляді (event, path, data).
+    """
+
+    MAX_REDIRECTS = 3
+
+    def __init__(self, url, params=None, timeout=60):
+        self.url = url
+        self.params = params or {}
+        self.timeout = timeout
+        self.bytes_read = 0
+        self.events_read = 0
+        self._connection = None
+        self._response = None
+        self._sock = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self):
+        url = self.url
+        for _ in range(self.MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            connection_class = (http.client.HTTPSConnection
+                                 if parts.scheme == 'https' else http.client.HTTPConnection)
+            connection = connection_class(parts.netloc, timeout=self.timeout)
+            query = parts.query
+            if self.params:
+                query = f"{query}&{urlencode(self.params)}" if query else urlencode(self.params)
+            target = parts.path + (f"?{query}" if query else "")
+
+            connection.request('GET', target, headers={'Accept': 'text/event-stream'})
+            # Після getresponse() з'єднання може віддати сокет відповіді - зберігаємо для close()
+            sock = connection.sock
+            response = connection.getresponse()
+
+            # Firebase може перенаправити на інший вузол бази; Location уже містить
+            # параметри запиту, тому з неї береться лише вузол, а шлях і параметри - свої
+            if response.status in (301, 302, 307, 308):
+                location = urlsplit(response.getheader('Location') or '')
+                if location.netloc:
+                    url = urlunsplit((location.scheme or parts.scheme, location.netloc,
+                                      parts.path, parts.query, ''))
+                connection.close()
+                continue
+
+            if response.status != 200:
+                body = response.read(512).decode('utf-8', 'replace')
+                connection.close()
+                raise ConnectionError(f"HTTP {response.status}: {body}")
+
+            with self._lock:
+                if self._closed:
+                    connection.close()
+                    raise ConnectionError("Потік закрито")
+                self._connection = connection
+                self._response = response
+                self._sock = sock
+            return
+
+        raise ConnectionError("Забагато перенаправлень")
+
+    def events(self):
+        """Генератор подій (event, path, data) до закриття потоку"""
+        self._open()
+        event = None
+        data_lines = []
+
+        while True:
+            line = self._response.readline()
+            if not line:
+                return
+            self.bytes_read += len(line)
+            line = line.decode('utf-8').rstrip('\r\n')
+
+            if line.startswith('event:'):
+                event = line[6:].strip()
+            elif line.startswith('data:'):
+                data_lines.append(line[5:].strip())
+            elif not line and event:
+                payload = '\n'.join(data_lines)
+                current_event = event
+                event, data_lines = None, []
+                self.events_read += 1
+
+                if current_event == 'keep-alive':
+                    continue
+                if current_event in ('cancel', 'auth_revoked'):
+                    raise StreamCancelled(current_event, payload)
+
+                message = json.loads(payload) if payload else None
+                if current_event in ('put', 'patch') and isinstance(message, dict):
+                    yield current_event, message.get('path', '/'), message.get('data')
+
+    def close(self):
+        """Закриття з'єднання (можна викликати з іншого потоку)"""
+        with self._lock:
+            self._closed = True
+            connection, sock = self._connection, self._sock
+            self._connection = self._sock = None
+        if sock:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if connection:
+            connection.close()
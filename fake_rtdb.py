@@ -0,0 +1,516 @@
+"""Локальна заміна Firebase Realtime Database для офлайн тестування.
+
+Підтримує REST GET/PUT/PATCH/DELETE за шляхом `<path>.json` (keep-alive, gzip),
+параметри GET shallow, orderBy ("$key", "$value" або поле), limitToFirst/limitToLast,
+ETag (`X-Firebase-ETag: true`, умовний GET з `If-None-Match` - 304) та потік подій
+SSE (`Accept: text/event-stream`) з подіями put/patch як у Firebase.
+--redirect-port відкриває вузол, що відповідає 307 з повною адресою запиту.
+Генератор змін (--rate або сценарій --script) додає записи у випадкові папки.
+
+Запуск: python fake_rtdb.py --port 9000 --folders 5000 --entries 20 --rate 1000
+Сценарій: [{"duration": 60, "rate": 100}, {"duration": 30, "rate": 1000}]
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import queue
+import random
+from collections import deque
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+def _encode(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _split_path(path):
+    return [p for p in path.split('/') if p]
+
+
+class QueryError(ValueError):
+    """Некоректний запит - відповідь 400 {"error": ...}, як у Firebase"""
+
+
+def _sort_key(value):
+    # Порядок Firebase: null, false, true, числа, рядки, об'єкти
+    if value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (1, value)
+    if isinstance(value, (int, float)):
+        return (2, value)
+    if isinstance(value, str):
+        return (3, value)
+    return (4, 0)
+
+
+def generate_tree(folders, entries, unrelated=0, seed=0):
+    """Синтетичне дерево бази: frequency/<папка>/<запис> + сторонні дані поруч"""
+    rng = random.Random(seed)
+    now = time.time()
+    tree = {'frequency': {}}
+    for i in range(folders):
+        tree['frequency'][f"folder_{i:05d}"] = {
+            f"entry_{j:06d}": {
+                'name': f"{rng.uniform(100, 500):.3f}",
+                'timestamp': now - rng.uniform(0, 86400),
+                'status': 'active'
+            }
+            for j in range(entries)
+        }
+    if unrelated:
+        tree['unrelated'] = {f"item_{i:06d}": {'payload': 'x' * 64, 'n': i} for i in range(unrelated)}
+    return tree
+
+
+class MutationGenerator:
+    """Синтетичні зміни /frequency: нові записи у випадкових папках.
+
+    Кожна зміна додає запис з поточним timestamp; з keep=True найстаріший
+    запис папки видаляється, тож розмір бази лишається сталим.
+    """
+
+    def __init__(self, tree, seed=0, keep=True):
+        self.rng = random.Random(seed)
+        self.keep = keep
+        self.counter = 0
+        self.folders = {
+            folder_name: deque(sorted(entries, key=lambda entry_id: entries[entry_id].get('timestamp', 0)))
+            for folder_name, entries in (tree.get('frequency') or {}).items()
+        }
+        self.names = list(self.folders)
+
+    def mutations(self, folders=1):
+        """Зміни для folders різних папок: список (шлях, значення або None - видалення)"""
+        result = []
+        for folder_name in self.rng.sample(self.names, min(folders, len(self.names))):
+            self.counter += 1
+            entry_id = f"new_{self.counter:08d}"
+            result.append((['frequency', folder_name, entry_id], {
+                'name': f"{self.rng.uniform(100, 500):.3f}",
+                'timestamp': time.time(),
+                'status': 'active'
+            }))
+            entry_ids = self.folders[folder_name]
+            entry_ids.append(entry_id)
+            if self.keep and len(entry_ids) > 1:
+                result.append((['frequency', folder_name, entry_ids.popleft()], None))
+        return result
+
+
+class FakeDatabase:
+    """Дерево даних у пам'яті з підписниками на зміни"""
+
+    def __init__(self, data=None, indexed=None):
+        self.data = data if isinstance(data, dict) else {}
+        self.lock = threading.Lock()
+        self.listeners = []
+        self.indexed = indexed  # Поля з ".indexOn" для orderBy (None - усі)
+        self.version = 0  # Номер зміни; кешовані відповіді дійсні, поки він не змінився
+        self._responses = {}
+
+    def _node(self, parts):
+        node = self.data
+        for key in parts:
+            if not isinstance(node, dict) or key not in node:
+                return None
+            node = node[key]
+        return node
+
+    def _apply(self, parts, value):
+        self.version += 1
+        if not parts:
+            self.data = value if isinstance(value, dict) else {}
+            return
+        key = parts[0]
+        if len(parts) == 1:
+            if value is None:
+                self.data.pop(key, None)
+            else:
+                self.data[key] = value
+            return
+
+        node, path = self.data, []
+        for part in parts[:-1]:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                if value is None:
+                    return
+                child = node[part] = {}
+            path.append((node, part))
+            node = child
+        if value is None:
+            node.pop(parts[-1], None)
+            # Порожні вузли у Firebase не існують
+            for parent, part in reversed(path):
+                if parent[part]:
+                    break
+                del parent[part]
+        else:
+            node[parts[-1]] = value
+
+    def get_json(self, parts):
+        with self.lock:
+            return _encode(self._node(parts))
+
+    def query(self, parts, shallow=False, order_by=None, limit_to_first=None, limit_to_last=None):
+        """Відповідь GET з параметрами запиту: (тіло JSON, ETag).
+
+        Відповіді кешуються до наступної зміни бази, тож повторні опитування
+        незмінених даних (у т.ч. з ETag) не серіалізують вузол заново.
+        """
+        if (limit_to_first is not None or limit_to_last is not None) and order_by is None:
+            raise QueryError("orderBy must be defined when other query parameters are defined")
+        if shallow and order_by is not None:
+            raise QueryError("Mixing shallow and orderBy is not supported")
+
+        key = (tuple(parts), shallow, order_by, limit_to_first, limit_to_last)
+        with self.lock:
+            cached = self._responses.get(key)
+            if cached and cached[0] == self.version:
+                return cached[1], cached[2]
+
+            node = self._node(parts)
+            if shallow and isinstance(node, dict):
+                node = {k: True if isinstance(v, dict) else v for k, v in node.items()}
+            elif order_by is not None and isinstance(node, dict):
+                node = self._ordered(parts, node, order_by, limit_to_first, limit_to_last)
+            body = _encode(node)
+            version = self.version
+
+        etag = hashlib.sha1(body).hexdigest()
+        with self.lock:
+            if len(self._responses) > 1000:
+                self._responses.clear()
+            self._responses[key] = (version, body, etag)
+        return body, etag
+
+    def _ordered(self, parts, node, order_by, limit_to_first, limit_to_last):
+        if order_by == '$key':
+            items = sorted(node.items())
+        elif order_by == '$value':
+            items = sorted(node.items(), key=lambda item: (_sort_key(item[1]), item[0]))
+        elif order_by.startswith('$'):
+            raise QueryError(f"orderBy {order_by} is not supported")
+        else:
+            if self.indexed is not None and order_by not in self.indexed:
+                raise QueryError(
+                    f'Index not defined, add ".indexOn": "{order_by}", '
+                    f'for path "/{"/".join(parts)}", to the rules')
+            items = sorted(node.items(), key=lambda item: (
+                _sort_key(item[1].get(order_by) if isinstance(item[1], dict) else None), item[0]))
+        if limit_to_first is not None:
+            items = items[:limit_to_first]
+        if limit_to_last is not None:
+            items = items[-limit_to_last:] if limit_to_last else []
+        return dict(items)
+
+    def set(self, parts, value):
+        with self.lock:
+            self._apply(parts, value)
+            self._notify('put', parts, value)
+
+    def update(self, parts, values):
+        with self.lock:
+            for key, value in values.items():
+                self._apply(parts + _split_path(key), value)
+            self._notify('patch', parts, values)
+
+    def subscribe(self, parts):
+        """Підписка на зміни під шляхом; першою подією йде put з поточним значенням"""
+        listener = (parts, queue.Queue())
+        with self.lock:
+            listener[1].put(self._event('put', [], self._node(parts)))
+            self.listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener):
+        with self.lock:
+            if listener in self.listeners:
+                self.listeners.remove(listener)
+
+    def close(self):
+        with self.lock:
+            for _, events in self.listeners:
+                events.put(None)
+
+    @staticmethod
+    def _event(event, parts, data):
+        message = _encode({'path': '/' + '/'.join(parts), 'data': data})
+        return b"event: " + event.encode() + b"\ndata: " + message + b"\n\n"
+
+    def _notify(self, event, parts, data):
+        for listener_parts, events in self.listeners:
+            depth = len(listener_parts)
+            if parts[:depth] == listener_parts:
+                events.put(self._event(event, parts[depth:], data))
+            elif listener_parts[:len(parts)] == parts:
+                # Запис вище підписки - надсилаємо новий стан підписаного вузла
+                events.put(self._event('put', [], self._node(listener_parts)))
+
+
+class FakeRTDBHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    keepalive_interval = 30
+
+    def log_message(self, format, *args):
+        pass
+
+    def _parts(self):
+        path = urlsplit(self.path).path
+        if path.endswith('.json'):
+            path = path[:-5]
+        return _split_path(path)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'null')
+
+    def _send_json(self, body, status=200, etag=None):
+        compress = 'gzip' in self.headers.get('Accept-Encoding', '') and len(body) > 1024
+        if compress:
+            body = gzip.compress(body, compresslevel=5)
+        self.send_response(status)
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if compress:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_not_modified(self, etag):
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _query_params(self):
+        params = {key: values[-1] for key, values in parse_qs(urlsplit(self.path).query).items()}
+        try:
+            order_by = json.loads(params['orderBy']) if 'orderBy' in params else None
+            first = int(params['limitToFirst']) if 'limitToFirst' in params else None
+            last = int(params['limitToLast']) if 'limitToLast' in params else None
+        except ValueError:
+            raise QueryError("Invalid query parameters")
+        if order_by is not None and not isinstance(order_by, str):
+            raise QueryError("orderBy must be a string")
+        return {
+            'shallow': params.get('shallow') == 'true',
+            'order_by': order_by,
+            'limit_to_first': first,
+            'limit_to_last': last,
+        }
+
+    def do_GET(self):
+        if 'text/event-stream' in self.headers.get('Accept', ''):
+            self._stream(self._parts())
+            return
+
+        try:
+            body, etag = self.server.database.query(self._parts(), **self._query_params())
+        except QueryError as e:
+            self._send_json(_encode({'error': str(e)}), status=400)
+            return
+
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match and if_none_match == etag:
+            self._send_not_modified(etag)
+            return
+        with_etag = self.headers.get('X-Firebase-ETag') == 'true' or if_none_match
+        self._send_json(body, etag=etag if with_etag else None)
+
+    def do_PUT(self):
+        value = self._read_body()
+        self.server.database.set(self._parts(), value)
+        self._send_json(_encode(value))
+
+    def do_PATCH(self):
+        values = self._read_body()
+        if not isinstance(values, dict):
+            self._send_json(_encode({'error': 'PATCH очікує об\'єкт'}), status=400)
+            return
+        self.server.database.update(self._parts(), values)
+        self._send_json(_encode(values))
+
+    def do_DELETE(self):
+        self.server.database.set(self._parts(), None)
+        self._send_json(b'null')
+
+    def _stream(self, parts):
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+
+        listener = self.server.database.subscribe(parts)
+        try:
+            while True:
+                try:
+                    message = listener[1].get(timeout=self.keepalive_interval)
+                except queue.Empty:
+                    message = b"event: keep-alive\ndata: null\n\n"
+                if message is None:
+                    break
+                self.wfile.write(message)
+                self.wfile.flush()
+        except OSError:
+            pass
+        finally:
+            self.server.database.unsubscribe(listener)
+
+
+class FakeRTDBServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, data=None, handler=FakeRTDBHandler, indexed=None):
+        super().__init__(address, handler)
+        self.database = FakeDatabase(data, indexed)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def stop(self):
+        self.database.close()
+        self.shutdown()
+        self.server_close()
+
+
+class RedirectHandler(BaseHTTPRequestHandler):
+    """Відповідь 307 на будь-який запит з повною адресою на іншому вузлі, як у Firebase"""
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _redirect(self):
+        self.server.redirects += 1
+        self.send_response(307)
+        self.send_header('Location', self.server.target.rstrip('/') + self.path)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    do_GET = do_PUT = do_PATCH = do_DELETE = _redirect
+
+
+class RedirectServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, target):
+        super().__init__(address, RedirectHandler)
+        self.target = target
+        self.redirects = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def run_mutations(database, generator, phases, stop=None, tick=0.01):
+    """Сценарій навантаження: phases - [(тривалість, змінених папок за секунду)].
+
+    Тривалість 0 - фаза без кінця. Зміни застосовуються пачками раз на tick
+    секунд, щоб частота трималась і при тисячах записів за секунду.
+    Повертає кількість змінених папок.
+    """
+    stop = stop or threading.Event()
+    total = 0
+    for duration, rate in phases:
+        start = time.perf_counter()
+        done = 0
+        while not stop.is_set():
+            elapsed = time.perf_counter() - start
+            if duration and elapsed >= duration:
+                break
+            due = int(elapsed * rate) - done
+            if due > 0:
+                for parts, value in generator.mutations(due):
+                    database.set(parts, value)
+                done += due
+            stop.wait(tick)
+        total += done
+        if stop.is_set():
+            break
+    return total
+
+
+def start_server(data=None, host='127.0.0.1', port=0, indexed=None):
+    """Запуск сервера у фоновому потоці; повертає FakeRTDBServer з атрибутом url"""
+    server = FakeRTDBServer((host, port), data, indexed=indexed)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def start_redirect_server(target, host='127.0.0.1', port=0):
+    """Вузол, що перенаправляє всі запити на target; повертає RedirectServer з атрибутом url"""
+    server = RedirectServer((host, port), target)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальна заміна Firebase Realtime Database")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--folders', type=int, default=50)
+    parser.add_argument('--entries', type=int, default=20)
+    parser.add_argument('--unrelated', type=int, default=0, help="кількість сторонніх записів поруч з frequency")
+    parser.add_argument('--rate', type=float, default=0, help="змінених папок за секунду (нові записи)")
+    parser.add_argument('--duration', type=float, default=0, help="тривалість змін, секунди (0 - без кінця)")
+    parser.add_argument('--script', help="JSON сценарій: [{\"duration\": секунди, \"rate\": змін за секунду}, ...]")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-index', action='store_true', help="orderBy за полями відхиляється, як без .indexOn")
+    parser.add_argument('--redirect-port', type=int, default=0, help="порт вузла, що перенаправляє (307) на цей сервер")
+    args = parser.parse_args()
+
+    tree = generate_tree(args.folders, args.entries, args.unrelated, seed=args.seed)
+    server = FakeRTDBServer((args.host, args.port), tree, indexed=set() if args.no_index else None)
+    print(f"Fake RTDB: {server.url}")
+    if args.redirect_port:
+        redirect = start_redirect_server(server.url, args.host, args.redirect_port)
+        print(f"Перенаправлення: {redirect.url} -> {server.url}")
+
+    if args.script:
+        with open(args.script, encoding='utf-8') as script_file:
+            phases = [(phase.get('duration', 0), phase.get('rate', 0)) for phase in json.load(script_file)]
+    else:
+        phases = [(args.duration, args.rate)] if args.rate else []
+    stop = threading.Event()
+    if phases:
+        generator = MutationGenerator(tree, seed=args.seed)
+
+        def mutate():
+            started = time.perf_counter()
+            total = run_mutations(server.database, generator, phases, stop)
+            print(f"Змінено папок: {total} за {time.perf_counter() - started:.1f} с")
+
+        threading.Thread(target=mutate, daemon=True).start()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.database.close()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,83 +1,335 @@
-import firebase_admin
-from firebase_admin import credentials, db
-import tkinter.messagebox as messagebox
-from datetime import datetime
-import json
+from datetime import datetime, timedelta
+from event_stream import EventStream
+import firebase_sdk
+import metrics
+import query_log
+from transport import AdminTransport, RestTransport
 
 class FirebaseManager:
-    def __init__(self, config_manager):
+    DEFAULT_APP_NAME = '[DEFAULT]'
+
+    def __init__(self, config_manager, name=None):
         self.config_manager = config_manager
+        self.name = name  # Ім'я бази (і застосунку firebase_admin) при моніторингу кількох баз
         self.firebase_app = None
         self.log_file = "firebase_queries.log"
+        self.query_log = None
         self.db = None  # Посилання на модуль db
+        self.transport = None
+        self.credential = None
+        self._token = None
+        self._token_expiry = None
+        self._stream = None
+        self._limit_unsupported = False
+        self.last_fetch_changed = True
+        self.bytes_received = 0
+        self.requests_made = 0
+        self.request_timings = {}
+        self._last_shape = None
+        self.probe_stats = {'probes': 0, 'skipped': 0}
+        self._reset_cache()
+
+    def _log(self, action, details, level=None):
+        """Логування дій у файл та консоль через спільний конвеєр log_pipeline"""
+        if self.query_log is None:
+            self.query_log = query_log.get_writer(
+                self.log_file,
+                level=self.config_manager.log_level,
+                max_bytes=self.config_manager.log_max_bytes,
+                backup_count=self.config_manager.log_backup_count
+            )
+        if level is None:
+            level = "ERROR" if action.endswith("_ERROR") else "INFO"
+        if self.name:
+            details = f"[{self.name}] {details}"
+        self.query_log.write(action, details, level)
 
-    def _log(self, action, details):
-        """Логування дій у файл та консоль"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
-        log_entry = f"[{timestamp}] {action}: {details}\n"
-        
-        print(log_entry.strip())  # Вивід у консоль
-        
-        # Запис у файл
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(log_entry)
+    @property
+    def app_name(self):
+        return self.name or self.DEFAULT_APP_NAME
 
     def authenticate(self):
         """Автентифікація у Firebase"""
         try:
-            if not firebase_admin._apps:  # Перевіряємо, чи не ініціалізовано
+            if self.config_manager.transport == 'rest' and not self.config_manager.json_file:
+                # Локальний сервер / емулятор не потребує ключа
+                self._log("AUTH", f"Підключення без ключа до {self.config_manager.firebase_url}")
+            elif self.app_name not in firebase_sdk.load()[0]._apps:  # Перевіряємо, чи не ініціалізовано
                 self._log("AUTH", f"Спроба підключення з файлом {self.config_manager.json_file}")
                 
                 # Ініціалізація з обліковими даними
+                firebase_admin, credentials, db = firebase_sdk.load()
                 cred = credentials.Certificate(self.config_manager.json_file)
+                self.credential = cred
                 self.firebase_app = firebase_admin.initialize_app(
                     cred, 
-                    {'databaseURL': self.config_manager.firebase_url}
+                    {'databaseURL': self.config_manager.firebase_url},
+                    name=self.app_name
                 )
                 self.db = db  # Встановлюємо посилання на db після ініціалізації
                 self._log("AUTH", "Успішна автентифікація")
             else:
-                self.firebase_app = firebase_admin.get_app()
+                firebase_admin, credentials, db = firebase_sdk.load()
+                self.firebase_app = firebase_admin.get_app(self.app_name)
+                self.credential = self.firebase_app.credential
                 self.db = db
                 self._log("AUTH", "Використовується існуюче з'єднання")
-                
-            return self.db
+
+            self.transport = self._create_transport()
+            return self.transport
         except Exception as e:
             error_msg = f"Помилка автентифікації: {str(e)}"
+            # Без діалогів: викликають з фонових потоків, помилку показує журнал
             self._log("AUTH_ERROR", error_msg)
-            messagebox.showerror("Помилка", error_msg)
             return None
 
-    def load_data(self):
-        """Завантаження даних з Firebase (з автоматичною автентифікацією)"""
-        if not self.db:
-            # Якщо не автентифіковані - спробуємо автентифікуватися
+    def _create_transport(self):
+        """Транспорт запитів: admin (firebase_admin.db) або rest (пул keep-alive з'єднань)"""
+        if self.config_manager.transport == 'rest':
+            transport = RestTransport(
+                self.config_manager.firebase_url,
+                token_provider=self._access_token,
+                pool_size=self.config_manager.pool_size,
+                connect_timeout=self.config_manager.connect_timeout,
+                read_timeout=self.config_manager.read_timeout
+            )
+        else:
+            transport = AdminTransport(self.db, self.firebase_app)
+            if not transport.response_hook_installed:
+                self._log("QUERY_WARNING", "HTTP сесія firebase_admin недоступна, розмір відповіді не рахується", "WARNING")
+        self._log("AUTH", f"Транспорт запитів: {transport.name}")
+        return transport
+
+    def load_data(self, limit=None):
+        """Завантаження даних з Firebase (з автоматичною автентифікацією)
+
+        limit - кількість останніх записів папки, потрібних для відображення;
+        використовується планом запиту 'limit'. Помилка автентифікації чи
+        запиту записується в журнал і передається далі - повтор і затримку
+        визначає викликач.
+        """
+        if not self.transport:
+            # Якщо не автентифіковані - спробуємо автентифікуватися; невдача - помилка
+            # опитування (затримка і перепідключення), а не порожні дані
             if not self.authenticate():
-                return {}
+                raise RuntimeError("не вдалося автентифікуватися")
+
+        plan = self._plan_query(limit)
+        detection = self._change_detection(plan)
+        start_time = datetime.now()
 
         try:
-            self._log("QUERY", "Початок завантаження даних з кореня бази")
-            start_time = datetime.now()
+            self._log("QUERY", f"Початок завантаження даних (план: {plan}, перевірка змін: {detection})", "DEBUG")
+            self.bytes_received = 0
+            self.requests_made = 0
+            self.request_timings = {}
             
-            ref = self.db.reference('/')
-            data = ref.get()
+            if plan == 'limit' or detection == 'shallow':
+                folders, changed = self._load_folders(limit if plan == 'limit' else None, detection == 'shallow')
+                data = {'frequency': folders}
+            else:
+                data, changed = self._load_path('/' if plan == 'root' else 'frequency', detection == 'etag')
+                if plan == 'frequency':
+                    data = {'frequency': data or {}}
+            self.last_fetch_changed = changed
             
             duration = (datetime.now() - start_time).total_seconds()
-            data_size = len(json.dumps(data)) if data else 0
-            
+            self._record_metrics(duration, 'changed' if changed else 'unchanged')
+
+            if not changed:
+                self._log("QUERY_SKIPPED", (
+                    f"Дані не змінились. "
+                    f"Час перевірки: {duration:.3f} сек. "
+                    f"{self._transfer_stats()}. "
+                    f"{self._skip_rate()}"
+                ))
+                return data if data else {}
+
             self._log("QUERY_RESULT", (
                 f"Отримано дані. "
                 f"Час виконання: {duration:.3f} сек. "
-                f"Розмір даних: {data_size} байт\n"
-                f"Структура даних: {self._analyze_structure(data)}"
+                f"{self._transfer_stats()}. "
+                f"{self._skip_rate()}"
+                f"{self._structure_details(data)}"
             ))
             
             return data if data else {}
         except Exception as e:
+            self.last_fetch_changed = True
+            self._record_metrics((datetime.now() - start_time).total_seconds(), 'error')
             error_msg = f"Помилка завантаження: {str(e)}"
             self._log("QUERY_ERROR", error_msg)
-            messagebox.showerror("Помилка", error_msg)
-            return {}
+            raise
+
+    def _record_metrics(self, duration, result):
+        database = self.name or "default"
+        metrics.FETCH_SECONDS.observe(duration, database=database)
+        metrics.FETCH_BYTES.observe(self.bytes_received, database=database)
+        metrics.FETCHES.inc(database=database, result=result)
+        metrics.REQUESTS.inc(self.requests_made, database=database)
+
+    def _plan_query(self, limit):
+        """Вибір запиту: корінь бази, лише /frequency або останні N записів кожної папки"""
+        plan = self.config_manager.query_plan
+        if plan not in ('root', 'frequency', 'limit'):
+            plan = 'frequency'
+        if plan == 'limit' and (not limit or self._limit_unsupported):
+            plan = 'frequency'
+        return plan
+
+    def _change_detection(self, plan):
+        """Спосіб перевірки змін: etag (умовний GET), shallow (умовний GET кожної папки) або none"""
+        detection = self.config_manager.change_detection
+        if detection not in ('etag', 'shallow', 'none'):
+            detection = 'etag'
+        # Умовні запити по папках - лише для папок /frequency
+        if detection == 'shallow' and plan == 'root':
+            detection = 'etag'
+        return detection
+
+    def _load_path(self, path, use_etag):
+        """Завантаження вузла; з ETag повторне завантаження пропускається, якщо вузол не змінився"""
+        if not use_etag:
+            return self._get(path).data, True
+
+        self.probe_stats['probes'] += 1
+        etag = self._etags.get(path) if path in self._cache else None
+        response = self._get(path, etag=etag or True)
+
+        self._etags[path] = response.etag
+        if response.changed:
+            self._cache[path] = response.data
+            return response.data, True
+
+        self.probe_stats['skipped'] += 1
+        return self._cache[path], False
+
+    def _load_folders(self, limit, use_shallow):
+        """Завантаження папок /frequency по одній.
+
+        limit - limit_to_last(N) за timestamp замість усієї папки.
+        use_shallow - shallow запит списку папок, далі умовний GET (ETag) кожної
+        папки: незмінена папка не передається, змінена (будь-яке поле запису)
+        завантажується повністю - Firebase не поєднує ETag із запитами limit.
+        Коштує 1 + N запитів на опитування проти одного для etag.
+        """
+        folders = self._get('frequency', shallow=True).data or {}
+        changed = set(folders) != set(self._folder_cache)
+        result = {}
+
+        for folder_name in folders:
+            path = f'frequency/{folder_name}'
+
+            if use_shallow:
+                self.probe_stats['probes'] += 1
+                etag = self._folder_etags.get(folder_name) if folder_name in self._folder_cache else None
+                response = self._get(path, etag=etag or True)
+                self._folder_etags[folder_name] = response.etag
+                if not response.changed:
+                    self.probe_stats['skipped'] += 1
+                    result[folder_name] = self._folder_cache[folder_name]
+                    continue
+                entries = response.data
+            elif limit:
+                try:
+                    entries = self._get(path, order_by='timestamp', limit_to_last=limit).data
+                except Exception as e:
+                    # Без ".indexOn": "timestamp" у правилах бази запит відхиляється
+                    if 'index' not in str(e).lower():
+                        raise
+                    self._limit_unsupported = True
+                    self._log("QUERY_PLAN", f"Запит limit_to_last недоступний ({str(e)}), план змінено на frequency")
+                    limit = None
+                    entries = self._get(path).data
+            else:
+                entries = self._get(path).data
+
+            result[folder_name] = dict(entries) if isinstance(entries, dict) else {}
+            changed = True
+
+        self._folder_cache = result
+        return result, changed
+
+    def _get(self, path, **kwargs):
+        """Запит через транспорт з обліком байт і часу етапів за поточне опитування"""
+        response = self.transport.get(path, **kwargs)
+        self.requests_made += 1
+        self.bytes_received += response.nbytes
+        for stage, seconds in response.timings.items():
+            self.request_timings[stage] = self.request_timings.get(stage, 0) + seconds
+        return response
+
+    def _transfer_stats(self):
+        stats = f"Запитів: {self.requests_made}, отримано: {self.bytes_received} байт"
+        stages = ', '.join(
+            f"{stage} {self.request_timings[stage] * 1000:.1f} мс"
+            for stage in ('dns', 'connect', 'ttfb', 'body', 'total')
+            if stage in self.request_timings
+        )
+        return f"{stats} ({stages})" if stages else stats
+
+    def _structure_details(self, data):
+        """Структура даних для логу - на рівні DEBUG або коли змінився набір ключів верхнього рівня"""
+        shape = frozenset(data) if isinstance(data, dict) else type(data).__name__
+        if shape == self._last_shape and not self.query_log.is_enabled("DEBUG"):
+            return ""
+        self._last_shape = shape
+        return f"\nСтруктура даних: {self._analyze_structure(data)}"
+
+    def _skip_rate(self):
+        probes = self.probe_stats['probes']
+        skipped = self.probe_stats['skipped']
+        rate = skipped / probes * 100 if probes else 0
+        return f"Пропущено завантажень: {skipped}/{probes} ({rate:.1f}%)"
+
+    def _reset_cache(self):
+        self._etags = {}
+        self._cache = {}
+        self._folder_etags = {}
+        self._folder_cache = {}
+
+    def _access_token(self):
+        """OAuth2 токен для REST запитів (None, якщо ключ не вказано - локальний сервер)"""
+        if not self.config_manager.json_file:
+            return None
+        if self._token and self._token_expiry and self._token_expiry > datetime.utcnow() + timedelta(minutes=5):
+            return self._token
+        if not self.credential:
+            credentials = firebase_sdk.load()[1]
+            self.credential = credentials.Certificate(self.config_manager.json_file)
+        token_info = self.credential.get_access_token()
+        self._token = token_info.access_token
+        self._token_expiry = token_info.expiry
+        return self._token
+
+    def stream(self, path, on_event):
+        """Підписка на потік подій put/patch за шляхом (блокує до закриття потоку).
+
+        on_event(event, path, data) викликається для кожної події.
+        """
+        url = f"{self.config_manager.firebase_url.rstrip('/')}/{path.strip('/')}.json"
+        token = self._access_token()
+        stream = EventStream(url, params={'access_token': token} if token else None)
+        self._stream = stream
+
+        self._log("STREAM", f"Підписка на /{path.strip('/')}")
+        start_time = datetime.now()
+        try:
+            for event, event_path, data in stream.events():
+                on_event(event, event_path, data)
+        finally:
+            self._stream = None
+            duration = (datetime.now() - start_time).total_seconds()
+            self._log("STREAM_CLOSED", (
+                f"Тривалість: {duration:.1f} сек. "
+                f"Подій: {stream.events_read}. "
+                f"Отримано: {stream.bytes_read} байт"
+            ))
+
+    def close_stream(self):
+        """Закриття активного потоку подій"""
+        if self._stream:
+            self._stream.close()
 
     def _analyze_structure(self, data):
         """Аналіз структури даних для логування"""
@@ -94,13 +346,38 @@ class FirebaseManager:
             return structure
         return f"{type(data).__name__}({len(data)})"
 
+    def refresh_connection(self):
+        """Нове з'єднання та токен без втрати кешу даних (ETag, знімки папок)"""
+        self._log("REFRESH", "Оновлення з'єднання")
+        self.close_stream()
+        old_transport, self.transport = self.transport, None
+        self._token = None
+        self._token_expiry = None
+        if self.firebase_app:
+            try:
+                firebase_sdk.load()[0].delete_app(self.firebase_app)
+            except Exception as e:
+                self._log("REFRESH_ERROR", f"Помилка закриття застосунку: {str(e)}")
+            self.firebase_app = None
+            self.credential = None
+        if old_transport:
+            old_transport.close()
+        return self.authenticate()
+
     def cleanup(self):
         """Очищення з'єднання з Firebase"""
+        self.close_stream()
+        if self.transport:
+            self.transport.close()
+            self.transport = None
+            self._reset_cache()
         if self.firebase_app:
             try:
                 self._log("CLEANUP", "Спроба закриття з'єднання")
-                firebase_admin.delete_app(self.firebase_app)
+                firebase_sdk.load()[0].delete_app(self.firebase_app)
                 self.firebase_app = None
+                self.credential = None
+                self._token = None
                 self.db = None
                 self._log("CLEANUP", "З'єднання успішно закрите")
             except Exception as e:
@@ -0,0 +1,18 @@
+import threading
+
+# firebase_admin тягне google-cloud-* і grpc - це секунди в зібраній програмі,
+# тому SDK імпортується лише при першій автентифікації (вона йде у фоновому
+# потоці Monitor), а не при імпорті модулів до показу вікна
+_lock = threading.Lock()
+_modules = None
+
+
+def load():
+    """(firebase_admin, credentials, db); перший виклик імпортує SDK"""
+    global _modules
+    with _lock:
+        if _modules is None:
+            import firebase_admin
+            from firebase_admin import credentials, db
+            _modules = (firebase_admin, credentials, db)
+        return _modules
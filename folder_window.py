@@ -1,21 +1,24 @@
+import time
 import tkinter as tk
 from datetime import datetime
-import pyperclip
+
+import metrics
 
 class FolderFrame:
+    NUM_CELLS = 2
+    CELL_WIDTH = 150
     
-    def __init__(self, master, folder_name):
+    def __init__(self, master, folder_name, num_cells=None):
         self.master = master
         self.folder_name = folder_name
+        if num_cells:
+            self.NUM_CELLS = num_cells
         self.frequencies = []
         self.cell_data = {}
-        self.NUM_CELLS = 2
-        self.CELL_WIDTH = 150
+        self.grid_position = None  # (рядок, колонка) у сітці FolderManager
+        self.window_id = None  # Елемент canvas, в якому показана рамка
         
         self.main_frame = tk.Frame(master, padx=10, pady=5, bd=2, relief=tk.GROOVE)
-        
-        # self.main_frame.pack(side=tk.LEFT, fill=tk.X, padx=5, pady=5, anchor='nw')
-        self.main_frame.grid(sticky='nsew', padx=5, pady=5)
 
         self._setup_ui()
 
@@ -24,8 +27,9 @@ class FolderFrame:
         header_frame = tk.Frame(self.main_frame)
         header_frame.pack(fill=tk.X)
         
-        tk.Label(header_frame, text=f"Папка: {self.folder_name}", 
-                font=('Arial', 10, 'bold')).pack(side=tk.LEFT)
+        self.header_label = tk.Label(header_frame, text=f"Папка: {self.folder_name}", 
+                font=('Arial', 10, 'bold'))
+        self.header_label.pack(side=tk.LEFT)
         
         cells_frame = tk.Frame(self.main_frame)
         cells_frame.pack(fill=tk.X, pady=5)
@@ -102,6 +106,7 @@ class FolderFrame:
             freq = cell_info.get('original_name') or cell_info.get('frequency', '')
             
             if freq:
+                import pyperclip  # Потрібен лише при копіюванні, не при запуску
                 pyperclip.copy(str(freq))
                 self._show_status(f"Скопійовано: {freq}")
             else:
@@ -126,7 +131,15 @@ class FolderFrame:
 
         cell['frame'].after(2000, restore)
 
-    def update_frequencies(self, folder_data):
+    def show_folder(self, folder_name, folder_data, highlight=False):
+        """Показ папки в щойно створеній рамці або в рамці з пулу (після reset)"""
+        if folder_name != self.folder_name:
+            self.folder_name = folder_name
+            self.header_label.config(text=f"Папка: {folder_name}")
+            self.status_label.config(text="")
+        self.update_frequencies(folder_data, highlight)
+
+    def update_frequencies(self, folder_data, highlight=True):
         entries = list(folder_data.values()) if isinstance(folder_data, dict) else folder_data
         self.frequencies = entries[:self.NUM_CELLS] if entries else []
 
@@ -158,7 +171,7 @@ class FolderFrame:
             self.cells[i]['time_label'].config(text=time_str)
 
             # Якщо нові дані — фарбуємо
-            if is_new:
+            if is_new and highlight:
                 self._highlight_cell(i)
 
         # Очищення порожніх комірок
@@ -167,31 +180,102 @@ class FolderFrame:
             self.cells[i]['freq_label'].config(text="")
             self.cells[i]['time_label'].config(text="") 
 
+    def reset(self):
+        """Скидання стану перед поверненням у пул; віджети та прив'язки подій лишаються"""
+        self.folder_name = None
+        self.frequencies = []
+        self.cell_data = {}
+        self.grid_position = None
+
     def destroy(self):
         self.main_frame.destroy()
 
 
+class FolderFramePool:
+    """Приховані FolderFrame для повторного використання замість створення нових.
+
+    Рамки групуються за кількістю комірок; понад max_free рамки знищуються.
+    """
+
+    def __init__(self, canvas, max_free=500):
+        self.canvas = canvas
+        self.max_free = max_free
+        self.created = 0
+        self.reused = 0
+        self._free = {}  # кількість комірок -> рамки
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def acquire(self, folder_name, cells):
+        """(рамка, чи створена нова); рамка вже показана на canvas"""
+        free = self._free.get(cells)
+        if free:
+            frame = free.pop()
+            self._size -= 1
+            self.reused += 1
+            self.canvas.itemconfigure(frame.window_id, state='normal')
+            return frame, False
+
+        frame = FolderFrame(self.canvas, folder_name, cells)
+        frame.window_id = self.canvas.create_window(0, 0, window=frame.main_frame, anchor='nw')
+        self.created += 1
+        return frame, True
+
+    def release(self, frame):
+        if self._size >= self.max_free:
+            self.destroy(frame)
+            return
+        self.canvas.itemconfigure(frame.window_id, state='hidden')
+        frame.reset()
+        self._free.setdefault(frame.NUM_CELLS, []).append(frame)
+        self._size += 1
+
+    def destroy(self, frame):
+        self.canvas.delete(frame.window_id)
+        frame.destroy()
+
+    def clear(self):
+        for frames in self._free.values():
+            for frame in frames:
+                self.destroy(frame)
+        self._free = {}
+        self._size = 0
+
+
 class FolderManager:
+    """Віртуалізована сітка папок.
+
+    Дані всіх папок зберігаються в моделі (folders); рамки FolderFrame
+    існують лише для рядків у видимій області canvas плюс BUFFER_ROWS над і
+    під нею. При прокручуванні рамки папок, що вийшли з області, ховаються
+    і показують папки, що в неї увійшли.
+    """
+
+    BUFFER_ROWS = 2
+    SLOT_PADDING = 10
+
     def __init__(self, main_app):
         self.main_app = main_app
-        self.frames = {}
+        self.folders = {}  # Модель: папка -> записи (усі папки, у порядку появи)
+        self.order = []
+        self.frames = {}  # Рамки видимих папок
+        self._fresh = set()  # Нові папки, комірки яких підсвічуються при першому показі
+        self.slot_width = 0
+        self.slot_height = 0
+        self.columns = 1
+        self._render_pending = False
         
         # Створюємо контейнер з прокруткою
         self.container = tk.Frame(main_app.root)
         self.container.grid(row=1, column=0, sticky="nsew")  # Використовуємо grid
         
-        # Canvas для прокрутки
+        # Рамки розміщуються прямо на canvas як його елементи
         self.canvas = tk.Canvas(self.container)
         self.scrollbar = tk.Scrollbar(self.container, orient="vertical", command=self.canvas.yview)
-        self.scrollable_frame = tk.Frame(self.canvas)
-        
-        # Налаштування прокрутки
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
-        
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.configure(yscrollcommand=self._on_view_changed)
+        self.pool = FolderFramePool(self.canvas)
         
         # Розміщення елементів прокрутки
         self.canvas.grid(row=0, column=0, sticky="nsew")
@@ -204,55 +288,133 @@ class FolderManager:
         # Обробка зміни розміру
         self.canvas.bind("<Configure>", self._handle_canvas_resize)
         self.last_width = 0
+
     def _handle_canvas_resize(self, event):
-        if event.width == self.last_width:
-            return
-        self.last_width = event.width
-        self._arrange_frames()
+        if event.width != self.last_width:
+            self.last_width = event.width
+            self._update_layout()
+        self._schedule_render()
+
+    def _on_view_changed(self, first, last):
+        self.scrollbar.set(first, last)
+        self._schedule_render()
+
+    def _schedule_render(self):
+        if not self._render_pending:
+            self._render_pending = True
+            self.canvas.after_idle(self._render_viewport)
 
-    def _arrange_frames(self):
-        if not self.frames:
+    def _update_layout(self):
+        """Кількість колонок і розмір області прокрутки для всіх папок моделі"""
+        if not self.slot_width:
             return
-            
-        frames = [frame for frame in self.frames.values()]
-        frame_width = frames[0].main_frame.winfo_reqwidth() if frames else 200
-        frames_per_row = max(1, self.last_width // frame_width)
-        
-        for frame in frames:
-            frame.main_frame.pack_forget()
-            frame.main_frame.grid_forget()
-        
-        for i, frame in enumerate(frames):
-            row = i // frames_per_row
-            col = i % frames_per_row
-            frame.main_frame.grid(row=row, column=col, sticky='nw', padx=5, pady=5)
-        
-        self.scrollable_frame.update_idletasks()
-        self.canvas.config(scrollregion=self.canvas.bbox("all"))
+        self.columns = max(1, self.last_width // self.slot_width)
+        rows = -(-len(self.order) // self.columns)
+        self.canvas.config(scrollregion=(0, 0, self.columns * self.slot_width, rows * self.slot_height))
+
+    def _render_viewport(self):
+        """Рамки для папок видимої області; решта рамок ховається"""
+        self._render_pending = False
+        slot = (self.slot_width, self.slot_height)
+
+        if self.order and self.slot_height:
+            top = self.canvas.canvasy(0)
+            height = max(self.canvas.winfo_height(), self.slot_height)
+            first_row = max(0, int(top // self.slot_height) - self.BUFFER_ROWS)
+            last_row = int((top + height) // self.slot_height) + self.BUFFER_ROWS
+            start = first_row * self.columns
+            visible = self.order[start:(last_row + 1) * self.columns]
+        else:
+            # Розмір рамки ще невідомий - спершу створюється одна для вимірювання
+            start, visible = 0, self.order[:1]
+
+        visible_set = set(visible)
+        for folder_name in [name for name in self.frames if name not in visible_set]:
+            self.pool.release(self.frames.pop(folder_name))
+
+        for folder_name in visible:
+            if folder_name not in self.frames:
+                self.frames[folder_name] = self._acquire_frame(folder_name)
+        self._fresh.clear()
+
+        if slot != (self.slot_width, self.slot_height):
+            # Рамка виявилась більшою за слот - нова сітка і повторний розрахунок видимих
+            self._update_layout()
+            for frame in self.frames.values():
+                frame.grid_position = None
+            self._schedule_render()
+
+        for i, folder_name in enumerate(visible, start):
+            self._place(self.frames[folder_name], i)
+
+    def _place(self, frame, index):
+        position = divmod(index, self.columns)
+        if frame.grid_position != position:
+            self.canvas.coords(frame.window_id, position[1] * self.slot_width, position[0] * self.slot_height)
+            frame.grid_position = position
+
+    def _acquire_frame(self, folder_name):
+        frame, created = self.pool.acquire(folder_name, self.cells_for(folder_name))
+        if created:
+            frame.main_frame.update_idletasks()
+            self.slot_width = max(self.slot_width, frame.main_frame.winfo_reqwidth() + self.SLOT_PADDING)
+            self.slot_height = max(self.slot_height, frame.main_frame.winfo_reqheight() + self.SLOT_PADDING)
+        frame.show_folder(folder_name, self.folders[folder_name], highlight=folder_name in self._fresh)
+        return frame
+
+    def apply_changes(self, folders_data):
+        """Оновлення моделі змінених папок: {папка: записи або None - папку видалено}.
+
+        Рамки оновлюються лише для видимих папок; сітка перераховується тільки
+        при додаванні чи видаленні папок.
+        """
+        started = time.perf_counter()
+        rendered = 0
+        structure_changed = False
+        for folder_name, folder_data in folders_data.items():
+            if folder_data is None:
+                if self.folders.pop(folder_name, None) is not None:
+                    structure_changed = True
+                frame = self.frames.pop(folder_name, None)
+                if frame is not None:
+                    self.pool.release(frame)
+                continue
+
+            if folder_name not in self.folders:
+                structure_changed = True
+                self._fresh.add(folder_name)
+            self.folders[folder_name] = folder_data
+            frame = self.frames.get(folder_name)
+            if frame is not None:
+                frame.update_frequencies(folder_data)
+                rendered += 1
+
+        if structure_changed:
+            self.order = list(self.folders)
+            self._update_layout()
+            self._schedule_render()
+
+        metrics.UI_FOLDERS_RENDERED.inc(rendered)
+        metrics.UI_RENDER_SECONDS.observe(time.perf_counter() - started)
+
+    def cells_for(self, folder_name):
+        """Кількість комірок папки: folder_cells з config.json або NUM_CELLS"""
+        folder_cells = getattr(self.main_app.config_manager, 'folder_cells', None) or {}
+        return folder_cells.get(folder_name, FolderFrame.NUM_CELLS)
 
     def update_all_folders(self, frequencies_data):
-        # if not frequencies_data or 'frequency' not in frequencies_data:
-        #     self.close_all()
-        #     return
-            
+        """Повний знімок папок: відсутні у ньому папки видаляються"""
         folders_data = frequencies_data['frequency']
-        current_folders = set(self.frames.keys())
-        new_folders = set(folders_data.keys())
-        
-        for folder_name in current_folders - new_folders:
-            self.frames[folder_name].destroy()
-            del self.frames[folder_name]
-        
-        for folder_name in new_folders - current_folders:
-            self.frames[folder_name] = FolderFrame(self.scrollable_frame, folder_name)
-        
-        for folder_name, folder_data in folders_data.items():
-            if folder_name in self.frames:
-                self.frames[folder_name].update_frequencies(folder_data)
-        
-        self._arrange_frames()
+        changes = {folder_name: None for folder_name in self.folders.keys() - folders_data.keys()}
+        changes.update(folders_data)
+        self.apply_changes(changes)
 
     def close_all(self):
+        """Очищення сітки; рамки повертаються в пул, тож наступний запуск не створює їх заново"""
         for frame in self.frames.values():
-            frame.destroy()
-        self.frames = {}
\ No newline at end of file
+            self.pool.release(frame)
+        self.frames = {}
+        self.folders = {}
+        self.order = []
+        self._fresh = set()
+        self._update_layout()
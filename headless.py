@@ -0,0 +1,115 @@
+"""Моніторинг без вікна: зміни папок рядками JSON у stdout або файл.
+
+Кожен рядок - одна папка:
+  {"time": 1700000000.1, "type": "folder", "folder": "<папка>", "entries": [{"name": ..., "timestamp": ..., "status": ...}]}
+  {"time": 1700000000.1, "type": "removed", "folder": "<папка>"}
+Журнал пишеться у stderr і firebase_queries.log. Tk і дисплей не потрібні.
+
+Запуск: python headless.py [--config config.json] [--output changes.jsonl] [--once | --duration 60]
+"""
+import argparse
+import json
+import signal
+import sys
+import threading
+import time
+
+from config_manager import ConfigManager
+import log_pipeline
+from monitor_core import MonitorCore
+
+
+class JsonLinesWriter:
+    """Підписник MonitorCore: рядок JSON на кожну змінену папку"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.lines = 0
+        self._lock = threading.Lock()
+
+    def on_event(self, kind, data):
+        if kind == 'folders':
+            self.write_folders(data)
+        elif kind == 'log':
+            message, level = data
+            log_pipeline.get_pipeline().emit(level, message)
+
+    def write_folders(self, folders):
+        if not folders:
+            return
+        now = time.time()
+        lines = [
+            json.dumps({'time': now, 'type': 'removed', 'folder': folder_name}, ensure_ascii=False)
+            if entries is None else
+            json.dumps({'time': now, 'type': 'folder', 'folder': folder_name, 'entries': entries},
+                       ensure_ascii=False, default=str)
+            for folder_name, entries in folders.items()
+        ]
+        # Події приходять з кількох потоків пулу - рядки не перемішуються
+        with self._lock:
+            self.stream.write('\n'.join(lines) + '\n')
+            self.stream.flush()
+            self.lines += len(lines)
+
+
+def log_to_stderr():
+    """Журнал у stderr, щоб stdout лишався чистим потоком JSON"""
+    pipeline = log_pipeline.get_pipeline()
+    pipeline.console = False
+    pipeline.add_sink(lambda records: print(''.join(record.format() for record in records),
+                                            end='', file=sys.stderr, flush=True))
+    return pipeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--output', help="файл для рядків JSON (за замовчуванням stdout)")
+    parser.add_argument('--once', action='store_true', help="лише первинне завантаження")
+    parser.add_argument('--duration', type=float, default=0, help="секунд моніторингу (0 - до Ctrl+C / SIGTERM)")
+    parser.add_argument('--no-initial', action='store_true', help="не виводити папки первинного завантаження")
+    args = parser.parse_args()
+
+    pipeline = log_to_stderr()
+    config_manager = ConfigManager(args.config, on_error=lambda message: pipeline.emit("ERROR", message))
+    if not config_manager.read_config() or not config_manager.is_configured():
+        pipeline.emit("ERROR", f"Необхідно налаштувати підключення у {args.config}")
+        pipeline.close()
+        return 2
+
+    output = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+    writer = JsonLinesWriter(output)
+    core = MonitorCore(config_manager)
+    core.subscribe(writer.on_event)
+    core.configure()
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    started = time.perf_counter()
+    try:
+        authenticated, changes, loaded = core.load_initial()
+        if not args.no_initial:
+            writer.write_folders(changes)
+        pipeline.emit("INFO", f"Первинне завантаження: папок {len(changes)} за "
+                              f"{time.perf_counter() - started:.2f} с")
+        if not authenticated:
+            return 1
+        if args.once:
+            return 0
+
+        core.start()
+        stop.wait(args.duration or None)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        core.stop()
+        core.cleanup()
+        pipeline.emit("INFO", f"Записано рядків: {writer.lines}")
+        pipeline.close()
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
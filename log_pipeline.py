@@ -0,0 +1,137 @@
+import atexit
+import itertools
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+
+APP = 'app'
+
+
+class LogRecord:
+    __slots__ = ('seq', 'time', 'level', 'source', 'message')
+
+    def __init__(self, seq, time, level, source, message):
+        self.seq = seq
+        self.time = time
+        self.level = level
+        self.source = source
+        self.message = message
+
+    def format(self):
+        return f"[{self.time.strftime('%Y-%m-%d %H:%M:%S')}] [{self.level}] {self.message}\n"
+
+
+class LogPipeline:
+    """Єдиний шлях записів журналу з будь-яких потоків.
+
+    Виробник лише створює LogRecord і додає його в deque - без блокувань,
+    файлового вводу-виводу та звернень до Tk. Потік конвеєра раз на
+    flush_interval забирає накопичене пакетом і передає його приймачам
+    (консоль, файл журналу запитів, кільцевий буфер LogWindow).
+    Черга обмежена capacity; при переповненні відкидаються найстаріші записи.
+    Відкинуті рахуються за номерами із запізненням на один пакет: номер
+    береться і запис додається не атомарно, тож записи з номерами після
+    попереднього пакета ще можуть бути на шляху до черги.
+    """
+
+    def __init__(self, capacity=10000, flush_interval=0.2, console=True):
+        self.flush_interval = flush_interval
+        self.console = console
+        self.dropped = 0
+        self._queue = deque(maxlen=capacity)
+        self._seq = itertools.count(1)
+        self._max_seq = 0  # Найбільший номер, отриманий з черги до поточного пакета
+        self._accounted = 0  # Отримані записи з номерами до _max_seq
+        self._recent = []  # Номери отриманих записів, більші за _max_seq
+        self._sinks = []
+        self._closers = []
+        self._flush_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def emit(self, level, message, source=APP):
+        self._queue.append(LogRecord(next(self._seq), datetime.now(), level, source, message))
+
+    def add_sink(self, sink, close=None):
+        """sink(records) викликається в потоці конвеєра з кожним пакетом"""
+        self._sinks.append(sink)
+        if close:
+            self._closers.append(close)
+
+    def remove_sink(self, sink):
+        if sink in self._sinks:
+            self._sinks.remove(sink)
+
+    def _run(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self, final=False):
+        with self._flush_lock:
+            batch = self._drain(final)
+            if not batch:
+                return
+            for sink in list(self._sinks):
+                try:
+                    sink(batch)
+                except Exception as e:
+                    print(f"Помилка приймача журналу: {e}", file=sys.stderr)
+
+    def _drain(self, final=False):
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.popleft())
+            except IndexError:
+                break
+        # Потоки можуть додати записи не в порядку номерів
+        batch.sort(key=lambda record: record.seq)
+
+        # Номери до межі мали цілий інтервал, щоб потрапити в чергу: яких немає - витіснені
+        watermark = self._max_seq
+        if batch:
+            self._max_seq = max(self._max_seq, batch[-1].seq)
+        if final:
+            watermark = self._max_seq
+        recent = self._recent + [record.seq for record in batch]
+        self._accounted += sum(1 for seq in recent if seq <= watermark)
+        self._recent = [seq for seq in recent if seq > watermark]
+        lost = watermark - self._accounted - self.dropped
+        if lost > 0:
+            self.dropped += lost
+            batch.insert(0, LogRecord(batch[0].seq if batch else self._max_seq, datetime.now(), 'WARNING', APP,
+                                      f"Відкинуто записів журналу через переповнення черги: {lost}"))
+        if not batch:
+            return batch
+
+        if self.console:
+            print(''.join(record.format() for record in batch), end='')
+        return batch
+
+    def close(self):
+        """Передача залишку черги приймачам та їх закриття"""
+        self._closed.set()
+        self._thread.join(timeout=5)
+        self.flush(final=True)
+        for close in self._closers:
+            try:
+                close()
+            except Exception as e:
+                print(f"Помилка закриття журналу: {e}", file=sys.stderr)
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline():
+    """Спільний конвеєр журналу процесу"""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = LogPipeline()
+                atexit.register(_pipeline.close)
+    return _pipeline
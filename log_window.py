@@ -1,64 +1,116 @@
 import tkinter as tk
+from collections import deque
 from tkinter import scrolledtext
-from datetime import datetime
+
+import log_pipeline
+
 
 class LogWindow:
-    def __init__(self, main_app):
+    """Вікно журналу з кільцевим буфером записів.
+
+    Записи з будь-якого потоку йдуть через log_pipeline; потік конвеєра
+    складає їх у буфер, а потік Tk виводить нові записи пакетом fps разів
+    на секунду, поки вікно відкрите. Останні capacity записів зберігаються
+    завжди, найстаріші рядки віджета обрізаються до capacity.
+    """
+
+    def __init__(self, main_app, capacity=5000, fps=10, pipeline=None):
         self.main_app = main_app
         self.window = None
         self.text_widget = None
         self.is_visible = False
-    
+        self.capacity = capacity
+        self.render_interval = max(1, int(1000 / fps))
+        self.records = deque(maxlen=capacity)
+        self.pipeline = pipeline or log_pipeline.get_pipeline()
+        self.pipeline.add_sink(self._receive)
+        self._rendered_seq = 0
+        self._widget_lines = 0
+        self._render_job = None
+
     def toggle(self):
         if self.is_visible:
             self._hide()
         else:
             self._show()
-    
+
     def _show(self):
         if self.window and self.window.winfo_exists():
             self.window.lift()
             return
-            
+
         self.is_visible = True
         self.window = tk.Toplevel(self.main_app.root)
         self.window.title("Лог змін частот")
         self._setup_window()
-    
+
+        # Заповнення з буфера, далі - пакетний вивід нових записів
+        self._rendered_seq = 0
+        self._widget_lines = 0
+        self._render()
+
     def _setup_window(self):
         self.window.geometry("800x500")
-        
+
         tk.Button(
             self.window,
             text="Закрити лог",
             command=self.toggle,
         ).pack(pady=5)
-        
+
         self.text_widget = scrolledtext.ScrolledText(
-            self.window, 
-            wrap=tk.WORD, 
+            self.window,
+            wrap=tk.WORD,
             state='disabled'
         )
         self.text_widget.pack(expand=True, fill='both', padx=5, pady=5)
-        
+
         self.window.protocol("WM_DELETE_WINDOW", self.toggle)
-    
+
     def _hide(self):
+        if self._render_job:
+            self.window.after_cancel(self._render_job)
+            self._render_job = None
         if self.window and self.window.winfo_exists():
             self.window.destroy()
         self.is_visible = False
+        self.text_widget = None
 
     def add_log(self, message, level="INFO"):
         self.log(message, level)
 
-    
     def log(self, message, level="INFO"):
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        log_line = f"[{timestamp}] [{level}] {message}\n"
-        print(log_line, end='')
+        # Безпечно з будь-якого потоку: віджет не чіпається
+        self.pipeline.emit(level, message)
 
-        if self.text_widget and self.text_widget.winfo_exists():
+    def _receive(self, records):
+        self.records.extend(record for record in records if record.source == log_pipeline.APP)
+
+    def _new_records(self):
+        """Записи буфера, ще не виведені у віджет"""
+        records = list(self.records)  # Знімок: буфер доповнюється з інших потоків
+        start = len(records)
+        while start > 0 and records[start - 1].seq > self._rendered_seq:
+            start -= 1
+        return records[start:]
+
+    def _render(self):
+        self._render_job = None
+        if not self.is_visible or not self.text_widget or not self.text_widget.winfo_exists():
+            return
+
+        records = self._new_records()
+        if records:
+            self._rendered_seq = records[-1].seq
+            text = ''.join(record.format() for record in records)
             self.text_widget.config(state='normal')
-            self.text_widget.insert('end', log_line)
+            self.text_widget.insert('end', text)
+            self._widget_lines += text.count('\n')
+            if self._widget_lines > self.capacity:
+                excess = self._widget_lines - self.capacity
+                self.text_widget.delete('1.0', f'{excess + 1}.0')
+                self._widget_lines = self.capacity
             self.text_widget.see('end')
-            self.text_widget.config(state='disabled')
\ No newline at end of file
+            self.text_widget.config(state='disabled')
+
+        self._render_job = self.window.after(self.render_interval, self._render)
@@ -1,16 +1,13 @@
-from datetime import datetime
+import log_pipeline
 
 class Logger:
     def __init__(self, log_window):
         self.log_window = log_window
     
     def log(self, message, level="INFO"):
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        log_line = f"[{timestamp}] [{level}] {message}\n"
-        print(log_line, end='')
-        
-        if self.log_window and self.log_window.text_widget and self.log_window.text_widget.winfo_exists():
-            self.log_window.text_widget.config(state='normal')
-            self.log_window.text_widget.insert('end', log_line)
-            self.log_window.text_widget.see('end')
-            self.log_window.text_widget.config(state='disabled')
\ No newline at end of file
+        # Той самий конвеєр, що й у LogWindow: запис не чекає ні на Tk, ні на консоль
+        if self.log_window:
+            self.log_window.log(message, level)
+            return
+
+        log_pipeline.get_pipeline().emit(level, message)
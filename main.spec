@@ -6,7 +6,7 @@ a = Analysis(
     pathex=['.', 'firebaseMonitor'],
     binaries=[],
     datas=[('app.ico', '.')],
-    hiddenimports=['config_manager', 'firebase_manager', 'log_window', 'logger', 'monitor', 'settings_window'],
+    hiddenimports=['config_manager', 'delta_engine', 'event_stream', 'firebase_manager', 'firebase_sdk', 'log_pipeline', 'log_window', 'logger', 'metrics', 'monitor', 'monitor_core', 'poll_schedule', 'profiler', 'query_log', 'settings_window', 'snapshot_cache', 'top_k', 'transport', 'ui_channel'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
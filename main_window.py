@@ -2,7 +2,6 @@ import tkinter as tk
 from tkinter import Menu, messagebox
 from config_manager import ConfigManager
 from settings_window import SettingsWindow
-from firebase_manager import FirebaseManager
 from monitor import Monitor
 from folder_window import FolderManager
 from log_window import LogWindow
@@ -11,7 +10,6 @@ class MainApp:
     def __init__(self):
         self.root = tk.Tk()
         self.config_manager = ConfigManager()
-        self.firebase_manager = FirebaseManager(self.config_manager)
         self.monitor = Monitor(self)
         self.folder_manager = FolderManager(self)
         self.log_window = LogWindow(self)
@@ -20,14 +18,8 @@ class MainApp:
         self._initialize_data()
 
     def _initialize_data(self):
-        if self.config_manager.read_config():
-            try:
-                data = self.firebase_manager.load_data()
-                self.folder_manager.update_all_folders(data)
-                self.status_bar.config(text="Підключено до Firebase")
-            except Exception as e:
-                self.status_bar.config(text=f"Помилка: {str(e)}")
-                self.log_window.add_log(f"Помилка ініціалізації: {str(e)}")
+        # Вікно з'являється одразу, автентифікація і перше завантаження - у фоні
+        self.monitor.preload()
 
     def _setup_main_window(self):
         self.root.title("Моніторинг частот Firebase")
@@ -127,7 +119,7 @@ class MainApp:
     
     def on_closing(self):
         self.monitor.stop()
-        self.firebase_manager.cleanup()
+        self.monitor.cleanup()
         self.folder_manager.close_all()
         self.root.destroy()
     
@@ -136,7 +128,6 @@ class MainApp:
     def __init__(self):
         self.root = tk.Tk()
         self.config_manager = ConfigManager()
-        self.firebase_manager = FirebaseManager(self.config_manager)
         self.monitor = Monitor(self)
         self.folder_manager = FolderManager(self)
         self.log_window = LogWindow(self)
@@ -145,14 +136,8 @@ class MainApp:
         self._initialize_data()
 
     def _initialize_data(self):
-        if self.config_manager.read_config():
-            try:
-                data = self.firebase_manager.load_data()
-                self.folder_manager.update_all_folders(data)
-                self.status_bar.config(text="Підключено до Firebase")
-            except Exception as e:
-                self.status_bar.config(text=f"Помилка: {str(e)}")
-                self.log_window.add_log(f"Помилка ініціалізації: {str(e)}")
+        # Вікно з'являється одразу, автентифікація і перше завантаження - у фоні
+        self.monitor.preload()
 
     def _setup_main_window(self):
         self.root.title("Моніторинг частот Firebase")
@@ -278,7 +263,7 @@ class MainApp:
     
     def on_closing(self):
         self.monitor.stop()
-        self.firebase_manager.cleanup()
+        self.monitor.cleanup()
         self.folder_manager.close_all()
         self.root.destroy()
     
@@ -0,0 +1,190 @@
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels)
+    if extra:
+        items.append(extra)
+    if not items:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in items) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self):
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _samples(self):
+        lines = []
+        for key, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+class Registry:
+    """Набір метрик процесу; render() - текстовий формат Prometheus"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text):
+        return self._register(Counter(name, help_text))
+
+    def gauge(self, name, help_text):
+        return self._register(Gauge(name, help_text))
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help_text, buckets))
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+# Опитування Firebase (FirebaseManager.load_data)
+FETCH_SECONDS = registry.histogram('firebase_fetch_seconds', "Час завантаження даних з Firebase")
+FETCH_BYTES = registry.histogram('firebase_fetch_bytes', "Розмір відповіді за одне опитування, байт", SIZE_BUCKETS)
+FETCHES = registry.counter('firebase_fetches_total', "Опитування за результатом: changed, unchanged, error")
+REQUESTS = registry.counter('firebase_requests_total', "HTTP запити до Firebase")
+
+# Планувальник і обробка (Monitor)
+SCHEDULER_LAG = registry.histogram('monitor_scheduler_lag_seconds', "Запізнення запуску опитування відносно запланованого часу")
+POLLS_IN_FLIGHT = registry.gauge('monitor_polls_in_flight', "Опитування, що виконуються в пулі")
+PROCESSING_SECONDS = registry.histogram('monitor_processing_seconds', "Обробка отриманих даних: дельта та вигляди папок")
+
+# Потік Tk (Monitor._process_updates, FolderManager)
+UI_BATCH_FOLDERS = registry.histogram('ui_batch_folders', "Змінених папок у пакеті з каналу оновлень (глибина черги)", COUNT_BUCKETS)
+UI_COALESCED = registry.counter('ui_coalesced_total', "Стани папок, замінені новішими до показу")
+UI_PROCESS_SECONDS = registry.histogram('ui_process_seconds', "Обробка пакета змін у потоці Tk")
+UI_RENDER_SECONDS = registry.histogram('ui_render_seconds', "Оновлення рамок папок у FolderManager")
+UI_FOLDERS_RENDERED = registry.counter('ui_folders_rendered_total', "Оновлені рамки видимих папок")
+CHANGE_TO_PIXELS = registry.histogram('ui_change_to_pixels_seconds', "Від отримання зміни до перемальовування вікна")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve(port, host='127.0.0.1'):
+    """Запуск (або перезапуск на іншій адресі) HTTP сервера метрик; port 0 - вимкнено.
+
+    Повертає True, якщо сервер запущено саме цим викликом.
+    """
+    global _server
+    with _server_lock:
+        if _server is not None:
+            if _server.server_address[1] == port and _server.host == host:
+                return False
+            _server.shutdown()
+            _server.server_close()
+            _server = None
+        if not port:
+            return False
+        server = ThreadingHTTPServer((host, port), _Handler)
+        server.daemon_threads = True
+        server.host = host
+        threading.Thread(target=server.serve_forever, daemon=True, name='metrics').start()
+        _server = server
+        return True
@@ -1,24 +1,55 @@
 import threading
 import time
-from datetime import datetime, timedelta
-import queue
+from folder_window import FolderFrame
+import metrics
+from monitor_core import MonitorCore
+from snapshot_cache import SnapshotCache
+from ui_channel import UpdateChannel
+
 
 class Monitor:
+    """Моніторинг для вікна Tk: MonitorCore + показ змін через UpdateChannel у потоці Tk"""
+
     def __init__(self, main_app):
         self.main_app = main_app
-        self.event = threading.Event()
-        self.thread = None
-        self.is_active = False
-        self.next_restart_time = None
-        self.data_queue = queue.Queue()
-        self.last_data = {}
-        self.interval = 1  # Update interval in seconds
+        self.core = MonitorCore(main_app.config_manager, FolderFrame.NUM_CELLS)
+        self.core.subscribe(self._on_core_event)
+        self.loading = False  # Іде фонове первинне завантаження
+        self._start_requested = False
+        self._preloaded = False  # Дані завантажені, моніторинг ще не запущено
+        self.channel = UpdateChannel(main_app.root, self._process_updates)
+        self.ui_data = {}  # Дані, що відображаються (змінюються лише в потоці Tk)
+        self.cache = None
+        self._cache_dirty = False  # ui_data змінено після останньої передачі в кеш
+        self._cache_timer = False
+
+    @property
+    def is_active(self):
+        return self.core.is_active
+
+    @property
+    def workers(self):
+        return self.core.workers
+
+    def _on_core_event(self, kind, data):
+        # Фонові потоки: вікно не чіпається, зміни йдуть через канал, журнал - через конвеєр
+        if kind == 'folders':
+            self.channel.put_folders(data)
+        elif kind == 'snapshot':
+            self.channel.put_message('snapshot', data)
+        elif kind == 'log':
+            self.main_app.log_window.add_log(*data)
 
     def start(self):
         if self.is_active:
             self.main_app.log_window.add_log("Моніторинг вже активний", "INFO")
             return
-            
+
+        if self.loading:
+            # Моніторинг запуститься, щойно завершиться фонове завантаження
+            self._start_requested = True
+            return
+
         if not self.main_app.config_manager.read_config():
             self.main_app.show_settings()
             return
@@ -28,105 +59,153 @@ class Monitor:
             self.main_app.show_settings()
             return
 
-        if not self.main_app.firebase_manager.authenticate():
-            self.main_app.log_window.add_log("Помилка автентифікації Firebase", "ERROR")
+        self.core.configure()
+
+        if self._preloaded and not self.core.is_prepared():
+            # Налаштування змінились після завантаження при відкритті вікна - дані іншої бази
+            self.main_app.log_window.add_log("Налаштування змінено, повторне завантаження даних", "INFO")
+            self._preloaded = False
+            self._flush_cache()
+            self.ui_data = {}
+            self._update_ui_on_stop()
+
+        if self._preloaded:
+            self._activate()
+        else:
+            self._start_requested = True
+            self.load_in_background()
+
+    def preload(self):
+        """Показ даних з кешу і фонове первинне завантаження при відкритті вікна, без запуску моніторингу"""
+        if self.main_app.config_manager.read_config() and self.main_app.config_manager.is_configured():
+            self.core.configure()
+            self.load_cache()
+            self.load_in_background()
+
+    def load_cache(self):
+        """Заповнення вікна з локального кешу до будь-яких запитів до Firebase"""
+        cache_file = self.main_app.config_manager.cache_file
+        if not cache_file:
             return
-
+        if self.cache is None or self.cache.path != cache_file:
+            if self.cache is not None:
+                self._flush_cache()
+                self.cache.close()
+            self.cache = SnapshotCache(cache_file)
+
+        folders, saved_at = self.cache.load()
+        if not folders:
+            return
+        self.ui_data = {'frequency': folders}
+        self._update_ui(folders)
+        saved = time.strftime('%d.%m %H:%M:%S', time.localtime(saved_at)) if saved_at else "?"
+        self.main_app.log_window.add_log(f"Показано дані з кешу від {saved} (папок: {len(folders)})", "INFO")
+
+    def load_in_background(self):
+        """Автентифікація та перше завантаження в окремому потоці; вікно лишається чутливим"""
+        self.loading = True
+        self.main_app.status_bar.config(text="Підключення до Firebase...")
+        self.main_app.log_window.add_log("Завантаження даних...", "INFO")
+        thread = threading.Thread(target=self._background_load, daemon=True)
+        thread.start()
+
+    def _background_load(self):
         try:
-            raw_data = self.main_app.firebase_manager.load_data()
-            processed_data = self._process_firebase_data(raw_data)
-            self._update_ui(processed_data)
-            self.last_data = processed_data
+            result = self.core.load_initial()
         except Exception as e:
-            self.main_app.log_window.add_log(f"Помилка первинного завантаження: {str(e)}", "ERROR")
-
-        self.is_active = True
-        self.event.set()
-        self.next_restart_time = datetime.now() + timedelta(minutes=10)
-        
-        self.thread = threading.Thread(target=self._monitor_loop)
-        self.thread.daemon = True
-        self.thread.start()
-
-        self.main_app.root.after(100, self._process_updates)
-        self.main_app.log_window.add_log("Моніторинг запущено", "INFO")
+            result = e
+        self.channel.put_message('loaded', result)
+
+    def _on_loaded(self, result):
+        """Результат фонового завантаження (потік Tk)"""
+        self.loading = False
+        start_requested, self._start_requested = self._start_requested, False
+
+        if isinstance(result, Exception):
+            self.main_app.log_window.add_log(f"Помилка ініціалізації: {str(result)}", "ERROR")
+            self.main_app.status_bar.config(text=f"Помилка: {str(result)}")
+            return
+
+        authenticated, changes, loaded = result
+        self._apply_changes(self._with_stale_removed(changes, loaded))
+        if not authenticated:
+            self.main_app.log_window.add_log("Помилка автентифікації Firebase", "ERROR")
+            self.main_app.status_bar.config(text="Помилка автентифікації Firebase")
+            return
+
+        self._preloaded = True
+        if start_requested:
+            self._activate()
+        elif loaded or any(w.authenticated and w.mode == 'stream' for w in self.workers):
+            self.main_app.status_bar.config(text="Підключено до Firebase")
+        else:
+            self.main_app.status_bar.config(text="Не вдалося завантажити дані Firebase")
+
+    def _activate(self):
+        self._preloaded = False
+        self.core.start()
         self.main_app.status_bar.config(text="Моніторинг активний")
 
+    def load_initial_data(self):
+        """Синхронне первинне завантаження з оновленням вікна.
+
+        Повертає False, якщо не вдалося підключитися до жодної бази.
+        """
+        authenticated, changes, loaded = self.core.load_initial()
+        self._apply_changes(self._with_stale_removed(changes, loaded))
+        return authenticated
+
+    def _with_stale_removed(self, changes, loaded):
+        """Видалення показаних (з кешу чи до зупинки) папок, яких немає у свіжо завантажених базах"""
+        changes = dict(changes)
+        prefixes = [worker.folder_key('') for worker in loaded]
+        for folder_name in self.ui_data.get('frequency', {}):
+            if folder_name not in changes and any(folder_name.startswith(prefix) for prefix in prefixes):
+                changes[folder_name] = None
+        return changes
+
+    def _stale_folders(self, prefix, present):
+        """Видалення показаних папок бази (з кешу), яких немає в повному знімку потоку подій.
+
+        Повідомлення каналу обробляються до папок пакета, тому папки,
+        додані подіями після знімка, ще не в ui_data і не видаляються.
+        """
+        return {
+            folder_name: None for folder_name in self.ui_data.get('frequency', {})
+            if folder_name.startswith(prefix) and folder_name not in present
+        }
+
+    def cleanup(self):
+        """Закриття з'єднань усіх баз та пулу потоків"""
+        self._flush_cache()
+        self.core.cleanup()
+
     def stop(self):
+        self._start_requested = False
         if not self.is_active:
             return
 
-        self.is_active = False
-        self.event.clear()
-
-        if self.thread and self.thread.is_alive():
-            self.thread.join(timeout=2)
-
+        self._preloaded = False
+        self.core.stop()
+        self.channel.clear()
+        self._flush_cache()
+        # Вікно очищується: після перезапуску дані і кеш будуються лише зі свіжого завантаження
+        self.ui_data = {}
         self._update_ui_on_stop()
-        self.main_app.log_window.add_log("Моніторинг зупинено", "INFO")
         self.main_app.status_bar.config(text="Моніторинг зупинено")
 
     def _update_ui_on_stop(self):
         if hasattr(self.main_app, 'folder_manager'):
             self.main_app.folder_manager.close_all()
 
-    def _process_firebase_data(self, raw_data):
-        processed_data = {'frequency': {}}
-
-        if not raw_data or 'frequency' not in raw_data:
-            return processed_data
-
-        for folder_name, folder_data in raw_data['frequency'].items():
-            if not isinstance(folder_data, dict):
-                continue
-
-            frequencies = []
-            for entry_id, entry_data in folder_data.items():
-                try:
-                    if not isinstance(entry_data, dict):
-                        continue
-
-                    freq = {
-                        'name': entry_data.get('name', ''),
-                        'name': entry_data.get('name', ''),
-                        'timestamp': entry_data.get('timestamp', time.time()),
-                        'status': entry_data.get('status', 'unknown')
-                    }
-                    frequencies.append(freq)
-                except Exception as e:
-                    self.main_app.log_window.add_log(
-                        f"Помилка обробки частоти {entry_id}: {str(e)}",
-                        "ERROR")
-                    continue
-
-            frequencies.sort(key=lambda x: x.get('timestamp', 0), reverse=True)
-            processed_data['frequency'][folder_name] = frequencies[:2]
-
-        return processed_data
-
-    def _has_data_changed(self, new_data):
-        """Check if the new data is different from the last data."""
-        old_folders = set(self.last_data.get('frequency', {}).keys())
-        new_folders = set(new_data.get('frequency', {}).keys())
-
-        if old_folders != new_folders:
-            return True
-
-        for folder in new_folders:
-            old_entries = self.last_data.get('frequency', {}).get(folder, [])
-            new_entries = new_data.get('frequency', {}).get(folder, [])
-            if old_entries != new_entries:
-                return True
-
-        return False
-
-    def _update_ui(self, processed_data):
+    def _update_ui(self, changes):
+        """Передача у вікно лише змінених папок (None - папку видалено)"""
         if not hasattr(self.main_app, 'folder_manager'):
             return
 
         formatted_data = {}
-        for folder_name, frequencies in processed_data.get('frequency', {}).items():
-            formatted_data[folder_name] = [
+        for folder_name, frequencies in changes.items():
+            formatted_data[folder_name] = None if frequencies is None else [
                 {
                     'frequency': f.get('name', ''),
                     'name': f.get('name', ''),
@@ -135,50 +214,61 @@ class Monitor:
                 for f in frequencies
             ]
 
-        self.main_app.folder_manager.update_all_folders({'frequency': formatted_data})
-
-    def _monitor_loop(self):
-        while self.event.is_set():
-            try:
-                if datetime.now() >= self.next_restart_time:
-                    self.data_queue.put(('restart', None))
-                    break
-
-                raw_data = self.main_app.firebase_manager.load_data()
-                processed_data = self._process_firebase_data(raw_data)
-
-                if not processed_data.get('frequency'):
-                    self.main_app.log_window.add_log("Немає даних від Firebase", "WARNING")
-                    time.sleep(self.interval)
-                    continue
-
-                if self._has_data_changed(processed_data):
-                    self.data_queue.put(('update', processed_data))
-                    self.last_data = processed_data
-
-                time.sleep(self.interval)
-
-            except Exception as e:
-                self.main_app.log_window.add_log(
-                    f"Критична помилка моніторингу: {str(e)}",
-                    "ERROR")
-                time.sleep(10)
+        self.main_app.folder_manager.apply_changes(formatted_data)
 
-    def _process_updates(self):
-        try:
-            while not self.data_queue.empty():
-                action, data = self.data_queue.get_nowait()
-
-                if action == 'update' and self.is_active:
-                    self._update_ui(data)
-
-                elif action == 'restart':
-                    self.stop()
-                    time.sleep(2)
-                    self.start()
-
-        except queue.Empty:
-            pass
-
-        if self.is_active:
-            self.main_app.root.after(100, self._process_updates)
+    def _apply_changes(self, changes):
+        """Злиття змінених папок (усіх баз) у відображувані дані та оновлення вікна"""
+        if not changes:
+            return
+        # Лише змінені папки: вартість пакета не залежить від кількості всіх папок
+        folders = self.ui_data.setdefault('frequency', {})
+        for folder_name, entries in changes.items():
+            if entries is None:
+                folders.pop(folder_name, None)
+            else:
+                folders[folder_name] = entries
+        self._update_ui(changes)
+        self._schedule_cache_save()
+
+    def _schedule_cache_save(self):
+        """Копія для кешу знімається не частіше ніж раз на min_interval кешу, а не на кожен пакет"""
+        if not self.cache:
+            return
+        self._cache_dirty = True
+        if not self._cache_timer:
+            self._cache_timer = True
+            self.main_app.root.after(int(self.cache.min_interval * 1000), self._on_cache_timer)
+
+    def _on_cache_timer(self):
+        self._cache_timer = False
+        self._flush_cache()
+
+    def _flush_cache(self):
+        """Передача копії відображуваних папок у кеш (потік Tk); словник далі змінюється на місці"""
+        if self._cache_dirty and self.cache:
+            self._cache_dirty = False
+            self.cache.save(dict(self.ui_data.get('frequency', {})))
+
+    def _process_updates(self, folders, messages):
+        """Пакет змін з каналу (потік Tk): одне оновлення вікна на пакет"""
+        with self.core.profile('process_updates'):
+            self._handle_updates(folders, messages)
+
+    def _handle_updates(self, folders, messages):
+        """Обробка пакета змін з каналу (потік Tk)"""
+        started = time.perf_counter()
+        for action, data in messages:
+            if action == 'loaded':
+                self._on_loaded(data)
+            elif action == 'snapshot' and self.is_active:
+                self._apply_changes(self._stale_folders(*data))
+
+        if folders and self.is_active:
+            metrics.UI_BATCH_FOLDERS.observe(len(folders))
+            self._apply_changes(folders)
+            since = self.channel.batch_since
+            if since is not None:
+                # Перемальовування віджетів Tk виконує в idle, раніше за цей виклик
+                self.main_app.root.after_idle(
+                    lambda: metrics.CHANGE_TO_PIXELS.observe(time.perf_counter() - since))
+        metrics.UI_PROCESS_SECONDS.observe(time.perf_counter() - started)
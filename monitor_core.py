@@ -0,0 +1,394 @@
+import contextlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from delta_engine import DeltaEngine
+from event_stream import StreamCancelled
+from firebase_manager import FirebaseManager
+import log_pipeline
+import metrics
+from poll_schedule import PollSchedule
+import profiler
+
+DEFAULT_CELLS = 2  # Записів папки для відображення, якщо не вказано інше
+
+_NO_PROFILE = contextlib.nullcontext()
+
+
+class DatabaseWorker:
+    """Стан моніторингу однієї бази: FirebaseManager, останні оброблені дані, копія /frequency"""
+
+    def __init__(self, database_config, namespace, cells=DEFAULT_CELLS):
+        self.config = database_config
+        self.name = database_config.name or "default"
+        self.namespace = namespace  # Префікс папок у FolderManager ('' для єдиної бази)
+        self.firebase_manager = FirebaseManager(database_config, name=database_config.name)
+        self.mode = database_config.mode
+        prefix = f"{namespace}/" if namespace else ''
+        folder_top_k = {
+            folder_key[len(prefix):]: folder_cells
+            for folder_key, folder_cells in (database_config.folder_cells or {}).items()
+            if folder_key.startswith(prefix)
+        }
+        self.engine = DeltaEngine(cells, folder_top_k)
+        # Запит останніх N записів має покрити найбільшу папку
+        self.query_limit = max([cells, *folder_top_k.values()])
+        self.schedule = PollSchedule(
+            min_interval=database_config.poll_interval,
+            max_interval=database_config.poll_max_interval,
+            idle_factor=database_config.poll_idle_factor,
+            error_delay=database_config.error_backoff,
+            max_error_delay=database_config.error_backoff_max)
+        self.authenticated = False
+        self.busy = False
+        self.next_poll = 0
+        self.last_success = 0  # Час останнього успішного опитування / події потоку
+        self.needs_refresh = False
+
+    def folder_key(self, folder_name):
+        return f"{self.namespace}/{folder_name}" if self.namespace else folder_name
+
+    def reset(self):
+        self.engine.reset()
+        self.schedule.reset()
+        self.next_poll = 0
+        self.last_success = time.time()
+        self.needs_refresh = False
+
+
+class MonitorCore:
+    """Ядро моніторингу без інтерфейсу: бази, планувальник опитувань, потоки подій.
+
+    Підписники subscribe(callback) отримують callback(kind, data) з фонових
+    потоків: 'folders' - {папка: новий вигляд або None - папку видалено},
+    'snapshot' - (префікс бази, усі її папки) після повного знімка потоку
+    подій, 'log' - (повідомлення, рівень). Вікно Tk (Monitor) і headless режим -
+    лише різні підписники.
+    """
+
+    def __init__(self, config_manager, cells=DEFAULT_CELLS):
+        self.config_manager = config_manager
+        self.cells = cells
+        self.event = threading.Event()
+        self.wakeup = threading.Event()  # Будить планувальник: зупинка або завершене опитування
+        self.stopped = threading.Event()  # Будить потоки подій, що чекають на перепідключення
+        self.thread = None
+        self.is_active = False
+        self.workers = []
+        self.executor = None
+        self.profiler = None
+        self._workers_signature = None
+        self._subscribers = []
+        self.max_wait = 60  # Найдовше очікування планувальника, секунди
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _publish(self, kind, data):
+        for callback in list(self._subscribers):
+            try:
+                callback(kind, data)
+            except Exception as e:
+                # Помилка підписника не зупиняє опитування
+                log_pipeline.get_pipeline().emit("ERROR", f"Помилка підписника моніторингу: {str(e)}")
+
+    def log(self, message, level="INFO"):
+        self._publish('log', (message, level))
+
+    def configure(self):
+        """Сервер метрик і режим профілювання за поточною конфігурацією"""
+        self._serve_metrics()
+        self._setup_profiler()
+
+    def _serve_metrics(self):
+        """Сторінка метрик Prometheus, якщо в конфігурації вказано metrics_port"""
+        config_manager = self.config_manager
+        try:
+            if metrics.serve(config_manager.metrics_port, config_manager.metrics_host):
+                self.log(f"Метрики: http://{config_manager.metrics_host}:{config_manager.metrics_port}/metrics", "INFO")
+        except OSError as e:
+            self.log(f"Не вдалося запустити сервер метрик: {str(e)}", "WARNING")
+
+    def _setup_profiler(self):
+        """Увімкнення/вимкнення режиму профілювання за конфігурацією або змінною середовища"""
+        config_manager = self.config_manager
+        enabled = config_manager.profile or profiler.enabled_by_env()
+        if enabled and self.profiler is None:
+            self.profiler = profiler.Profiler(
+                config_manager.profile_dir,
+                dump_interval=config_manager.profile_interval,
+                memory_interval=config_manager.profile_interval)
+            self.profiler.start()
+            self.log(f"Режим профілювання: файли у {os.path.abspath(config_manager.profile_dir)}", "INFO")
+        elif not enabled and self.profiler is not None:
+            self.profiler.close()
+            self.profiler = None
+
+    def profile(self, name):
+        # Без режиму профілювання - спільний порожній контекст
+        return self.profiler.section(name) if self.profiler else _NO_PROFILE
+
+    def load_initial(self):
+        """Автентифікація всіх баз і паралельне повне завантаження баз у режимі опитування.
+
+        Повертає (чи підключена хоч одна база, змінені папки, бази, завантажені повністю);
+        зміни не публікуються - їх показує той, хто викликав.
+        """
+        self._prepare_workers()
+        for worker in self.workers:
+            worker.reset()
+
+        for worker, authenticated in zip(self.workers, self.executor.map(
+                lambda w: bool(w.firebase_manager.authenticate()), self.workers)):
+            worker.authenticated = authenticated
+            if not authenticated:
+                self.log(f"Помилка автентифікації бази {worker.name}", "ERROR")
+
+        # У режимі потоку перша подія put і є повним завантаженням
+        poll_workers = [w for w in self.workers if w.authenticated and w.mode != 'stream']
+        changes = {}
+        loaded = []
+        for worker, result in zip(poll_workers, self.executor.map(self._load_worker, poll_workers)):
+            if isinstance(result, Exception):
+                self.log(f"Помилка первинного завантаження бази {worker.name}: {str(result)}", "ERROR")
+            else:
+                changes.update(result)
+                loaded.append(worker)
+
+        return any(worker.authenticated for worker in self.workers), changes, loaded
+
+    def _config_signature(self):
+        return [
+            (d.name, d.json_file, d.firebase_url, d.mode, d.transport, sorted((d.folder_cells or {}).items()))
+            for d in self.config_manager.databases
+        ]
+
+    def is_prepared(self):
+        """Обробники баз відповідають поточній конфігурації (після load_initial налаштування не змінювались)"""
+        return bool(self.workers) and self._config_signature() == self._workers_signature
+
+    def _prepare_workers(self):
+        """Обробники баз з конфігурації; повторно використовуються, поки список баз не змінився"""
+        config_manager = self.config_manager
+        signature = self._config_signature()
+        if signature != self._workers_signature:
+            self.cleanup()
+            multiple = config_manager.has_database_list
+            self.workers = [
+                DatabaseWorker(database, database.name if multiple else '', self.cells)
+                for database in config_manager.databases
+            ]
+            self._workers_signature = signature
+
+        if self.executor is None:
+            streams = sum(1 for w in self.workers if w.mode == 'stream')
+            self.executor = ThreadPoolExecutor(
+                max_workers=max(1, config_manager.max_workers) + streams,
+                thread_name_prefix='firebase')
+
+    def start(self):
+        """Запуск планувальника і потоків подій після load_initial"""
+        self.is_active = True
+        self.stopped.clear()
+        self.wakeup.clear()
+        self.event.set()
+
+        # Потоки подій тримають з'єднання постійно, тому кожному - окремий потік пулу
+        for worker in self.workers:
+            if worker.authenticated and worker.mode == 'stream':
+                self.executor.submit(self._stream_loop, worker)
+
+        self.thread = threading.Thread(target=self._monitor_loop, name='monitor')
+        self.thread.daemon = True
+        self.thread.start()
+        self.log("Моніторинг запущено", "INFO")
+
+    def stop(self):
+        if not self.is_active:
+            return
+        self.is_active = False
+        self.event.clear()
+        self.wakeup.set()
+        self.stopped.set()
+        for worker in self.workers:
+            worker.firebase_manager.close_stream()
+
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=2)
+        self.log("Моніторинг зупинено", "INFO")
+
+    def cleanup(self):
+        """Закриття з'єднань усіх баз та пулу потоків"""
+        for worker in self.workers:
+            worker.firebase_manager.cleanup()
+        self.workers = []
+        self._workers_signature = None
+        if self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def _folder_updates(self, worker, changes):
+        """Нові вигляди змінених папок бази з префіксом бази (None - папку видалено)"""
+        views = worker.engine.update_views(changes)
+        return {worker.folder_key(folder_name): view for folder_name, view in views.items()}
+
+    def _wait(self, timeout):
+        """Очікування до timeout секунд або до wakeup; False, якщо моніторинг зупинено"""
+        self.wakeup.wait(timeout)
+        return self.event.is_set()
+
+    def _monitor_loop(self):
+        """Планувальник: віддає опитування баз у спільний пул, коли настає їх час"""
+        while self.event.is_set():
+            # Скидається до перегляду баз: пробудження під час перегляду не загубиться
+            self.wakeup.clear()
+            try:
+                with self.profile('monitor_loop'):
+                    now = time.time()
+                    next_due = self._schedule_polls(now)
+
+                # Завершене опитування будить планувальник, щоб врахувати новий час бази
+                self._wait(max(0.0, next_due - now))
+
+            except Exception as e:
+                self.log(f"Критична помилка моніторингу: {str(e)}", "ERROR")
+                self._wait(10)
+
+    def _schedule_polls(self, now):
+        """Передача в пул опитувань, час яких настав; повертає час наступного"""
+        next_due = now + self.max_wait
+        for worker in self.workers:
+            if not worker.authenticated or worker.mode == 'stream' or worker.busy:
+                continue
+            self._check_health(worker, now)
+            if now >= worker.next_poll:
+                if worker.next_poll:
+                    metrics.SCHEDULER_LAG.observe(now - worker.next_poll, database=worker.name)
+                worker.busy = True
+                self.executor.submit(self._poll_worker, worker)
+            else:
+                next_due = min(next_due, worker.next_poll)
+        metrics.POLLS_IN_FLIGHT.set(sum(1 for worker in self.workers if worker.busy))
+        return next_due
+
+    def _check_health(self, worker, now):
+        """Позначка бази до перепідключення, якщо дані давно не оновлювались"""
+        stale_after = worker.config.stale_after
+        if not worker.needs_refresh and stale_after and now - worker.last_success > stale_after:
+            self.log(
+                f"Немає успішних опитувань бази {worker.name} понад {stale_after} с, перепідключення",
+                "WARNING")
+            worker.needs_refresh = True
+
+    def _record_error(self, worker):
+        """Затримка до повтору після помилки; після кількох помилок поспіль - перепідключення"""
+        delay = worker.schedule.on_error()
+        threshold = worker.config.refresh_after_errors
+        if threshold and worker.schedule.errors >= threshold:
+            worker.needs_refresh = True
+        return delay
+
+    def _refresh_worker(self, worker):
+        """Перепідключення бази у фоновому потоці; стан і вікна папок зберігаються"""
+        worker.needs_refresh = False
+        if not worker.firebase_manager.refresh_connection():
+            raise RuntimeError("не вдалося перепідключитися")
+        worker.last_success = time.time()
+        self.log(f"З'єднання з базою {worker.name} оновлено", "INFO")
+
+    def _load_worker(self, worker):
+        """Завантаження та обробка однієї бази; повертає змінені папки"""
+        try:
+            raw_data = worker.firebase_manager.load_data(limit=worker.query_limit)
+            changes = worker.engine.apply_snapshot(raw_data.get('frequency'))
+            return self._folder_updates(worker, changes)
+        except Exception as e:
+            return e
+
+    def _poll_worker(self, worker):
+        # Окрема статистика для кожного потоку пулу: завантаження, розбір і пошук змін
+        with self.profile('poll_worker'):
+            try:
+                if worker.needs_refresh:
+                    self._refresh_worker(worker)
+
+                raw_data = worker.firebase_manager.load_data(limit=worker.query_limit)
+
+                # Лише після отриманих даних: помилки автентифікації і запиту йдуть у except
+                worker.last_success = time.time()
+
+                # Firebase підтвердив, що дані не змінились - обробка не потрібна
+                if not worker.firebase_manager.last_fetch_changed:
+                    worker.next_poll = time.time() + worker.schedule.on_idle()
+                    return
+
+                if not raw_data.get('frequency'):
+                    self.log(f"Немає даних від Firebase ({worker.name})", "WARNING")
+                    worker.next_poll = time.time() + worker.schedule.on_idle()
+                    return
+
+                # Обробляються лише записи, що відрізняються від попереднього знімка
+                started = time.perf_counter()
+                changes = worker.engine.apply_snapshot(raw_data['frequency'])
+                updates = self._folder_updates(worker, changes)
+                metrics.PROCESSING_SECONDS.observe(time.perf_counter() - started, database=worker.name)
+                if updates:
+                    self._publish('folders', updates)
+                    worker.next_poll = time.time() + worker.schedule.on_change()
+                else:
+                    worker.next_poll = time.time() + worker.schedule.on_idle()
+
+            except Exception as e:
+                delay = self._record_error(worker)
+                self.log(
+                    f"Критична помилка моніторингу бази {worker.name}: {str(e)} "
+                    f"(повтор через {delay:.0f} с)",
+                    "ERROR")
+                worker.next_poll = time.time() + delay
+            finally:
+                worker.busy = False
+                self.wakeup.set()
+
+    def _stream_loop(self, worker):
+        worker.engine.reset()
+        while self.event.is_set():
+            try:
+                if worker.needs_refresh:
+                    self._refresh_worker(worker)
+                worker.firebase_manager.stream(
+                    'frequency',
+                    lambda event, path, data: self._on_stream_event(worker, event, path, data))
+                worker.schedule.reset()
+                delay = worker.schedule.min_interval
+            except Exception as e:
+                if not self.event.is_set():
+                    break
+                delay = self._record_error(worker)
+                if isinstance(e, StreamCancelled):
+                    # Firebase закрив потік (auth_revoked - токен застарів): одразу новий токен
+                    worker.needs_refresh = True
+                self.log(
+                    f"Помилка потоку подій бази {worker.name}: {str(e)} "
+                    f"(повторне підключення через {delay:.0f} с)",
+                    "ERROR")
+            if self.stopped.wait(delay):
+                break
+
+    def _on_stream_event(self, worker, event, path, data):
+        """Застосування події put/patch до стану бази і відправка змінених папок"""
+        worker.last_success = time.time()
+        with self.profile('stream_event'):
+            started = time.perf_counter()
+            changes = worker.engine.apply_event(event, path, data)
+            updates = self._folder_updates(worker, changes)
+            metrics.PROCESSING_SECONDS.observe(time.perf_counter() - started, database=worker.name)
+            self._publish('folders', updates)
+            if event == 'put' and not path.strip('/'):
+                # put / - повний знімок бази: решту показаних папок бази можна прибрати
+                self._publish('snapshot', (worker.folder_key(''), {
+                    worker.folder_key(folder_name) for folder_name in worker.engine.raw}))
@@ -0,0 +1,50 @@
+import random
+
+
+class PollSchedule:
+    """Інтервал опитування однієї бази.
+
+    Поки дані змінюються, опитування йде з min_interval; кожне опитування без
+    змін збільшує інтервал у idle_factor разів, але не більше max_interval.
+    Після помилок затримка росте експоненційно від error_delay до
+    max_error_delay. До всіх затримок додається випадковий розкид, щоб бази
+    й копії програми не зверталися до Firebase одночасно.
+    """
+
+    def __init__(self, min_interval=1, max_interval=30, idle_factor=1.5,
+                 error_delay=2, max_error_delay=300, jitter=0.2, rng=None):
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.idle_factor = idle_factor
+        self.error_delay = error_delay
+        self.max_error_delay = max_error_delay
+        self.jitter = jitter
+        self._rng = rng or random.Random()
+        self.reset()
+
+    def reset(self):
+        self.interval = self.min_interval
+        self.errors = 0
+
+    def on_change(self):
+        """Дані змінились - повернення до найшвидшого опитування; повертає затримку в секундах"""
+        self.errors = 0
+        self.interval = self.min_interval
+        return self._jittered(self.interval)
+
+    def on_idle(self):
+        """Змін немає - поступове уповільнення"""
+        self.errors = 0
+        self.interval = min(self.max_interval, self.interval * self.idle_factor)
+        return self._jittered(self.interval)
+
+    def on_error(self):
+        """Помилка - експоненційна затримка з розкидом у межах [delay / 2, delay]"""
+        self.errors += 1
+        delay = min(self.max_error_delay, self.error_delay * 2 ** min(self.errors - 1, 32))
+        return self._rng.uniform(delay / 2, delay)
+
+    def _jittered(self, delay):
+        if not self.jitter:
+            return delay
+        return delay * self._rng.uniform(1 - self.jitter, 1 + self.jitter)
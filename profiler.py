@@ -0,0 +1,160 @@
+import atexit
+import cProfile
+import glob
+import os
+import threading
+import time
+import tracemalloc
+
+import log_pipeline
+
+ENV_VAR = 'FIREBASE_MONITOR_PROFILE'
+
+
+def enabled_by_env():
+    return os.environ.get(ENV_VAR, '').strip().lower() not in ('', '0', 'false', 'no')
+
+
+class _Section:
+    """cProfile ділянки коду в одному потоці (для кожного потоку - свій екземпляр)"""
+
+    def __init__(self, profiler, name, thread_name):
+        self.profiler = profiler
+        self.name = name
+        self.thread_name = thread_name
+        self.profile = cProfile.Profile()
+        self.started = time.time()
+        self.calls = 0
+        self.skipped = 0
+        self.active = False
+
+    def __enter__(self):
+        if self.active:
+            # Вкладений виклик тієї ж ділянки вже профілюється
+            return self
+        try:
+            self.profile.enable()
+        except ValueError:
+            # Python 3.12+: у процесі одночасно може працювати лише один профайлер
+            self.skipped += 1
+            self.profiler.on_skipped(self)
+            return self
+        self.active = True
+        return self
+
+    def __exit__(self, *exc_info):
+        if not self.active:
+            return False
+        self.profile.disable()
+        self.active = False
+        self.calls += 1
+        if time.time() - self.started >= self.profiler.dump_interval:
+            self.dump()
+        return False
+
+    def dump(self):
+        if self.skipped:
+            log_pipeline.get_pipeline().emit(
+                "WARNING", f"Профілювання {self.name} ({self.thread_name}): пропущено {self.skipped} "
+                           f"з {self.calls + self.skipped} виконань - працював інший профайлер")
+            self.skipped = 0
+        if not self.calls:
+            return
+        prefix = f"{self.name}-{self.thread_name}"
+        path = self.profiler.path(f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+        try:
+            self.profile.dump_stats(path)
+        except OSError as e:
+            log_pipeline.get_pipeline().emit("ERROR", f"Помилка запису профілю {path}: {e}")
+        self.profiler.rotate(f"{prefix}-*.prof")
+        self.profile = cProfile.Profile()
+        self.started = time.time()
+        self.calls = 0
+
+
+class Profiler:
+    """Режим профілювання: cProfile ділянок коду та знімки tracemalloc.
+
+    section(name) - контекст для ітерації циклу; статистика ділянки
+    ведеться окремо для кожного потоку і пишеться у directory раз на
+    dump_interval секунд (файли <ділянка>-<потік>-<час>.prof відкриваються
+    через pstats або snakeviz). На Python 3.12+ одночасно активним може
+    бути лише один cProfile: ділянки, що перетнулися в часі з іншими,
+    пропускаються, а їх кількість пишеться в журнал. Знімки пам'яті .snap
+    (tracemalloc.Snapshot.load) робляться фоновим потоком раз на
+    memory_interval. Для кожного виду файлів зберігаються останні keep.
+    """
+
+    def __init__(self, directory='profiles', dump_interval=60, memory_interval=60, keep=10, frames=5):
+        self.directory = directory
+        self.dump_interval = dump_interval
+        self.memory_interval = memory_interval
+        self.keep = keep
+        self.frames = frames
+        self._sections = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = None
+        self._warned = False
+        os.makedirs(directory, exist_ok=True)
+
+    def start(self):
+        if self.memory_interval and not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        if self.memory_interval and self._thread is None:
+            self._thread = threading.Thread(target=self._memory_loop, daemon=True, name='profiler')
+            self._thread.start()
+        atexit.register(self.close)
+
+    def section(self, name):
+        thread = threading.current_thread()
+        key = (name, thread.ident)
+        section = self._sections.get(key)
+        if section is None:
+            with self._lock:
+                section = self._sections.setdefault(key, _Section(self, name, thread.name))
+        return section
+
+    def on_skipped(self, section):
+        if not self._warned:
+            self._warned = True
+            log_pipeline.get_pipeline().emit(
+                "WARNING", f"Профілювання {section.name} ({section.thread_name}) пропущено: "
+                           f"інший потік уже профілюється (Python 3.12+); пропуски рахуються у журналі")
+
+    def path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def rotate(self, pattern):
+        files = sorted(glob.glob(self.path(pattern)), key=os.path.getmtime)
+        for path in files[:-self.keep] if self.keep else []:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _memory_loop(self):
+        while not self._closed.wait(self.memory_interval):
+            self.snapshot_memory()
+
+    def snapshot_memory(self):
+        if not tracemalloc.is_tracing():
+            return
+        path = self.path(f"memory-{time.strftime('%Y%m%d-%H%M%S')}.snap")
+        try:
+            tracemalloc.take_snapshot().dump(path)
+        except OSError as e:
+            log_pipeline.get_pipeline().emit("ERROR", f"Помилка запису знімка пам'яті {path}: {e}")
+        self.rotate("memory-*.snap")
+
+    def close(self):
+        """Запис накопиченої статистики; ділянки, що зараз виконуються, пропускаються"""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        for section in list(self._sections.values()):
+            if not section.active:
+                section.dump()
+        if self._thread is not None:
+            self.snapshot_memory()
+            tracemalloc.stop()
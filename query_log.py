@@ -0,0 +1,90 @@
+import os
+import sys
+import threading
+
+import log_pipeline
+
+LOG_LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(path, **options):
+    """Спільний QueryLogWriter для файлу (кілька FirebaseManager пишуть в один журнал)"""
+    with _writers_lock:
+        writer = _writers.get(path)
+        if writer is None:
+            writer = _writers[path] = QueryLogWriter(path, **options)
+        return writer
+
+
+class QueryLogWriter:
+    """Журнал запитів поверх спільного конвеєра log_pipeline.
+
+    write() лише фільтрує за рівнем і додає запис у конвеєр; у файл записи
+    потрапляють пачками з потоку конвеєра, файл ротується за розміром.
+    """
+
+    def __init__(self, path, level='INFO', max_bytes=5 * 1024 * 1024, backup_count=3,
+                 pipeline=None):
+        self.path = path
+        self.level = LOG_LEVELS.get(str(level).upper(), LOG_LEVELS['INFO'])
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = None
+        self._size = 0
+        self.pipeline = pipeline or log_pipeline.get_pipeline()
+        self.pipeline.add_sink(self._write_records, close=self.close)
+
+    def is_enabled(self, level):
+        return LOG_LEVELS.get(level, LOG_LEVELS['INFO']) >= self.level
+
+    def write(self, action, details, level='INFO'):
+        if not self.is_enabled(level):
+            return
+        self.pipeline.emit(level, f"{action}: {details}", source=self.path)
+
+    def _write_records(self, records):
+        lines = [
+            f"[{record.time.strftime('%Y-%m-%d %H:%M:%S.%f')}] {record.message}\n"
+            for record in records if record.source == self.path
+        ]
+        if not lines:
+            return
+        try:
+            self._write_batch(lines)
+        except OSError as e:
+            print(f"Помилка запису журналу запитів: {e}", file=sys.stderr)
+
+    def _write_batch(self, lines):
+        if self._file is None:
+            self._open()
+        chunk = ''.join(lines)
+        self._file.write(chunk)
+        self._size += len(chunk.encode('utf-8'))
+        if self._size >= self.max_bytes:
+            self._rotate()
+        self._file.flush()
+
+    def _open(self):
+        self._file = open(self.path, 'a', encoding='utf-8', buffering=64 * 1024)
+        self._size = self._file.tell()
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{i}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
@@ -18,7 +18,7 @@ class SettingsWindow:
         self._setup_ui()
 
     def _setup_ui(self):
-        self.window.geometry("500x300")
+        self.window.geometry("500x330")
         self.window.resizable(False, False)
 
         # Заголовок
@@ -54,6 +54,14 @@ class SettingsWindow:
             fg='gray'
         ).pack(anchor='w', padx=20)
 
+        # Режим профілювання
+        self.profile_var = tk.BooleanVar(value=bool(self.config_manager.profile))
+        tk.Checkbutton(
+            self.window,
+            text=f"Режим профілювання (файли у {self.config_manager.profile_dir})",
+            variable=self.profile_var
+        ).pack(anchor='w', padx=15, pady=(10, 0))
+
         # Кнопки
         buttons_frame = tk.Frame(self.window)
         buttons_frame.pack(pady=20)
@@ -95,10 +103,12 @@ class SettingsWindow:
         #     messagebox.showerror("Помилка", "Будь ласка, введіть коректний URL Firebase у форматі:\nhttps://ваш-проект.firebaseio.com/")
         #     return
 
-        if not os.path.exists(json_file):
+        # Без ключа можна підключитися лише транспортом rest (локальний сервер, емулятор)
+        if (json_file or self.config_manager.transport != 'rest') and not os.path.exists(json_file):
             messagebox.showerror("Помилка", "Вказаний JSON файл не існує")
             return
 
+        self.config_manager.profile = self.profile_var.get()
         if self.config_manager.save_config(json_file, firebase_url):
             self.window.destroy()
             messagebox.showinfo("Успіх", "Налаштування збережено успішно!")
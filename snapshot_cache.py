@@ -0,0 +1,96 @@
+import atexit
+import os
+import threading
+import time
+
+import msgpack
+import zstandard
+
+import log_pipeline
+
+CACHE_VERSION = 1
+
+
+class SnapshotCache:
+    """Локальний кеш відображуваних папок (msgpack + zstd).
+
+    load() читає кеш синхронно, до будь-яких запитів до Firebase. save() лише
+    запам'ятовує останній стан; фоновий потік записує його не частіше ніж раз
+    на min_interval секунд у тимчасовий файл і атомарно підміняє ним кеш,
+    тому обірваний запис не псує попередню копію.
+    """
+
+    def __init__(self, path, min_interval=2.0, level=3):
+        self.path = path
+        self.min_interval = min_interval
+        self.level = level
+        self._pending = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = threading.Event()
+        self._thread = None
+        atexit.register(self.close)
+
+    def load(self):
+        """(папки, час збереження) з кешу або (None, None), якщо кешу немає чи він пошкоджений"""
+        try:
+            with open(self.path, 'rb') as cache_file:
+                payload = zstandard.ZstdDecompressor().decompress(cache_file.read())
+            snapshot = msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        except FileNotFoundError:
+            return None, None
+        except Exception as e:
+            log_pipeline.get_pipeline().emit("WARNING", f"Пошкоджений кеш {self.path}: {e}")
+            return None, None
+
+        if not isinstance(snapshot, dict) or snapshot.get('version') != CACHE_VERSION:
+            return None, None
+        return snapshot.get('folders') or {}, snapshot.get('saved_at')
+
+    def save(self, folders):
+        """Запис стану у фоні; словник папок не повинен змінюватись після передачі (передається копія)"""
+        with self._lock:
+            self._pending = folders
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._closed.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            self._write_pending()
+            # Часті зміни об'єднуються в один запис
+            self._closed.wait(self.min_interval)
+
+    def _write_pending(self):
+        with self._lock:
+            folders, self._pending = self._pending, None
+        if folders is None:
+            return
+        try:
+            self._write(folders)
+        except OSError as e:
+            log_pipeline.get_pipeline().emit("ERROR", f"Помилка запису кешу {self.path}: {e}")
+
+    def _write(self, folders):
+        payload = msgpack.packb(
+            {'version': CACHE_VERSION, 'saved_at': time.time(), 'folders': folders},
+            use_bin_type=True, default=str)
+        data = zstandard.ZstdCompressor(level=self.level).compress(payload)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as cache_file:
+            cache_file.write(data)
+            cache_file.flush()
+            os.fsync(cache_file.fileno())
+        os.replace(tmp_path, self.path)
+
+    def close(self):
+        """Запис останнього стану при завершенні програми або заміні кешу"""
+        atexit.unregister(self.close)
+        self._closed.set()
+        self._wakeup.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self._write_pending()
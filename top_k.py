@@ -0,0 +1,154 @@
+import heapq
+import itertools
+
+
+def _timestamp(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class _Item:
+    __slots__ = ('key', 'value', 'in_top', 'version')
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        self.in_top = False
+        self.version = 0
+
+
+class TopK:
+    """K найновіших записів папки за timestamp з доступом за entry_id.
+
+    top - мін-купа з K найновіших записів, rest - макс-купа решти.
+    Видалення ліниве: запис у купі дійсний, лише поки збігається його версія.
+    Додавання, оновлення та видалення змінюють купу top за O(log K);
+    купа rest (O(log n)) зачіпається лише при витісненні з top або
+    підтягуванні на місце видаленого. Серед записів з однаковим timestamp
+    вище стоїть доданий раніше - як при стабільному сортуванні.
+    """
+
+    def __init__(self, k):
+        if k < 1:
+            raise ValueError(f"TopK: k має бути не менше 1, отримано {k}")
+        self.k = k
+        self._items = {}
+        self._top = []  # (key, version, entry_id)
+        self._rest = []  # ((-timestamp, seq), version, entry_id)
+        self._top_size = 0
+        self._seq = itertools.count()
+        self._version = itertools.count(1)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, entry_id):
+        return entry_id in self._items
+
+    def ids(self):
+        return self._items.keys()
+
+    def get(self, entry_id, default=None):
+        item = self._items.get(entry_id)
+        return item.value if item else default
+
+    def set(self, entry_id, timestamp, value):
+        """Додавання або оновлення запису"""
+        old = self._items.get(entry_id)
+        if old is not None:
+            seq = -old.key[1]
+            self.remove(entry_id)
+        else:
+            seq = next(self._seq)
+
+        item = _Item((_timestamp(timestamp), -seq), value)
+        self._items[entry_id] = item
+
+        if self._top_size < self.k:
+            self._push_top(entry_id, item)
+            return
+
+        lowest_id = self._lowest_top()
+        lowest = self._items[lowest_id]
+        if item.key > lowest.key:
+            heapq.heappop(self._top)
+            self._top_size -= 1
+            self._push_rest(lowest_id, lowest)
+            self._push_top(entry_id, item)
+        else:
+            self._push_rest(entry_id, item)
+
+    def remove(self, entry_id):
+        item = self._items.pop(entry_id, None)
+        if item is None:
+            return False
+        if item.in_top:
+            self._top_size -= 1
+            # На місце видаленого - найновіший з решти
+            highest_id = self._highest_rest()
+            if highest_id is not None:
+                heapq.heappop(self._rest)
+                self._push_top(highest_id, self._items[highest_id])
+        self._compact()
+        return True
+
+    def top(self):
+        """Значення K найновіших записів, новіші першими"""
+        items = [
+            self._items[entry_id] for key, version, entry_id in self._top
+            if self._is_valid(entry_id, version, True)
+        ]
+        items.sort(key=lambda item: item.key, reverse=True)
+        return [item.value for item in items]
+
+    def resize(self, k):
+        entries = [(entry_id, item) for entry_id, item in self._items.items()]
+        self.k = k
+        self._rebuild(entries)
+
+    def _is_valid(self, entry_id, version, in_top):
+        item = self._items.get(entry_id)
+        return item is not None and item.version == version and item.in_top == in_top
+
+    def _push_top(self, entry_id, item):
+        item.in_top = True
+        item.version = next(self._version)
+        heapq.heappush(self._top, (item.key, item.version, entry_id))
+        self._top_size += 1
+
+    def _push_rest(self, entry_id, item):
+        item.in_top = False
+        item.version = next(self._version)
+        heapq.heappush(self._rest, ((-item.key[0], -item.key[1]), item.version, entry_id))
+
+    def _lowest_top(self):
+        while not self._is_valid(self._top[0][2], self._top[0][1], True):
+            heapq.heappop(self._top)
+        return self._top[0][2]
+
+    def _highest_rest(self):
+        while self._rest and not self._is_valid(self._rest[0][2], self._rest[0][1], False):
+            heapq.heappop(self._rest)
+        return self._rest[0][2] if self._rest else None
+
+    def _compact(self):
+        # Прибирання застарілих записів, коли їх стало більше, ніж дійсних
+        if len(self._top) + len(self._rest) > 2 * len(self._items) + 32:
+            self._rebuild(list(self._items.items()))
+
+    def _rebuild(self, entries):
+        entries.sort(key=lambda entry: entry[1].key, reverse=True)
+        self._top, self._rest, self._top_size = [], [], 0
+        for entry_id, item in entries[:self.k]:
+            item.in_top = True
+            item.version = next(self._version)
+            self._top.append((item.key, item.version, entry_id))
+        for entry_id, item in entries[self.k:]:
+            item.in_top = False
+            item.version = next(self._version)
+            self._rest.append(((-item.key[0], -item.key[1]), item.version, entry_id))
+        heapq.heapify(self._top)
+        heapq.heapify(self._rest)
+        self._top_size = len(self._top)
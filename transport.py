@@ -0,0 +1,272 @@
+import http.client
+import json
+import queue
+import socket
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit, urlencode
+
+
+class TransportError(Exception):
+    """Помилка REST запиту до Realtime Database"""
+
+    def __init__(self, status, message):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
+
+class TransportResponse:
+    """Результат GET запиту.
+
+    changed - False, якщо умовний запит за ETag повернув 304.
+    nbytes - байти тіла відповіді в мережі (до розпакування gzip).
+    timings - секунди по етапах: dns, connect, ttfb, body, total.
+    """
+
+    def __init__(self, data=None, etag=None, changed=True, nbytes=0, timings=None):
+        self.data = data
+        self.etag = etag
+        self.changed = changed
+        self.nbytes = nbytes
+        self.timings = timings or {}
+
+
+class AdminTransport:
+    """Запити через firebase_admin.db (з'єднаннями керує SDK)"""
+
+    name = 'admin'
+
+    def __init__(self, db, app=None):
+        self.db = db
+        self.app = app
+        self._bytes_received = 0
+        self._lock = threading.Lock()
+        self.response_hook_installed = self._install_response_hook()
+
+    def _install_response_hook(self):
+        """Підрахунок байт відповіді на рівні HTTP сесії firebase_admin (без серіалізації даних)"""
+        try:
+            session = self.db.reference('/', app=self.app)._client.session
+        except AttributeError:
+            return False
+        if self._on_response not in session.hooks['response']:
+            session.hooks['response'].append(self._on_response)
+        return True
+
+    def _on_response(self, response, *args, **kwargs):
+        # Content-Length - байти в мережі (для gzip - стиснуті); інакше фактично прочитані
+        length = response.headers.get('Content-Length')
+        with self._lock:
+            self._bytes_received += int(length) if length else len(response.content)
+
+    def get(self, path, shallow=False, order_by=None, limit_to_last=None, etag=False):
+        """etag: False - без ETag, True - отримати ETag, рядок - умовний запит"""
+        ref = self.db.reference(path, app=self.app)
+        bytes_before = self._bytes_received
+        start = time.perf_counter()
+
+        if order_by:
+            query = ref.order_by_child(order_by)
+            if limit_to_last:
+                query = query.limit_to_last(limit_to_last)
+            response = TransportResponse(query.get())
+        elif isinstance(etag, str):
+            changed, data, new_etag = ref.get_if_changed(etag)
+            response = TransportResponse(data, new_etag, changed)
+        elif etag:
+            data, new_etag = ref.get(etag=True)
+            response = TransportResponse(data, new_etag)
+        else:
+            response = TransportResponse(ref.get(shallow=shallow))
+
+        response.nbytes = self._bytes_received - bytes_before
+        response.timings = {'total': time.perf_counter() - start}
+        return response
+
+    def close(self):
+        pass
+
+
+class RestTransport:
+    """REST запити через пул keep-alive з'єднань http.client.
+
+    З'єднання повторно використовуються між опитуваннями, відповіді
+    запитуються стиснутими (gzip/deflate), для кожного запиту вимірюються
+    етапи DNS / з'єднання (TCP+TLS) / перший байт / тіло.
+    pool_size - скільки вільних з'єднань тримати відкритими (0 - без keep-alive).
+    """
+
+    name = 'rest'
+
+    def __init__(self, base_url, token_provider=None, pool_size=4,
+                 connect_timeout=10, read_timeout=30, compress=True):
+        self.token_provider = token_provider
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.compress = compress
+        self._idle = queue.LifoQueue()
+        self._set_base_url(base_url)
+
+    def _set_base_url(self, base_url):
+        parts = urlsplit(base_url)
+        self._set_origin(parts)
+        self.base_path = parts.path.rstrip('/')
+        self.base_query = parts.query
+
+    def _set_origin(self, parts):
+        self.scheme = parts.scheme or 'https'
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.scheme == 'https' else 80)
+
+    def _new_connection(self, timings):
+        connection_class = (http.client.HTTPSConnection
+                            if self.scheme == 'https' else http.client.HTTPConnection)
+        connection = connection_class(self.host, self.port, timeout=self.connect_timeout)
+
+        def create_connection(address, timeout, source_address=None):
+            start = time.perf_counter()
+            addresses = socket.getaddrinfo(address[0], address[1], 0, socket.SOCK_STREAM)
+            timings['dns'] = time.perf_counter() - start
+
+            error = None
+            for family, socktype, proto, _, sockaddr in addresses:
+                sock = socket.socket(family, socktype, proto)
+                try:
+                    sock.settimeout(timeout)
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    sock.connect(sockaddr)
+                    return sock
+                except OSError as e:
+                    sock.close()
+                    error = e
+            raise error or OSError(f"Не вдалося з'єднатися з {address[0]}")
+
+        connection._create_connection = create_connection
+        start = time.perf_counter()
+        connection.connect()
+        # connect() включає DNS, TCP та TLS - DNS рахуємо окремо
+        timings['connect'] = time.perf_counter() - start - timings.get('dns', 0)
+        connection.sock.settimeout(self.read_timeout)
+        return connection
+
+    def _acquire(self, timings):
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return self._new_connection(timings), False
+
+    def _release(self, connection):
+        if self._idle.qsize() < self.pool_size:
+            self._idle.put(connection)
+        else:
+            connection.close()
+
+    def _target(self, path, params):
+        query = dict(params)
+        token = self.token_provider() if self.token_provider else None
+        if token:
+            query['access_token'] = token
+        query_string = urlencode(query)
+        if self.base_query:
+            query_string = f"{self.base_query}&{query_string}" if query_string else self.base_query
+        target = f"{self.base_path}/{path.strip('/')}.json".replace('//', '/')
+        return f"{target}?{query_string}" if query_string else target
+
+    def get(self, path, shallow=False, order_by=None, limit_to_last=None, etag=False):
+        """etag: False - без ETag, True - отримати ETag, рядок - умовний запит"""
+        params = {}
+        if shallow:
+            params['shallow'] = 'true'
+        if order_by:
+            params['orderBy'] = json.dumps(order_by)
+            if limit_to_last:
+                params['limitToLast'] = limit_to_last
+
+        headers = {}
+        if self.compress:
+            headers['Accept-Encoding'] = 'gzip, deflate'
+        if etag:
+            headers['X-Firebase-ETag'] = 'true'
+        if isinstance(etag, str):
+            headers['If-None-Match'] = etag
+
+        return self._request(path, params, headers)
+
+    def _request(self, path, params, headers, redirects=3):
+        timings = {'dns': 0.0, 'connect': 0.0}
+        start = time.perf_counter()
+        target = self._target(path, params)
+        connection, reused = self._acquire(timings)
+
+        try:
+            connection.request('GET', target, headers=headers)
+            response = connection.getresponse()
+        except ConnectionError:
+            connection.close()
+            if not reused:
+                raise
+            # Сервер закрив неактивне keep-alive з'єднання - повтор на новому
+            connection = self._new_connection(timings)
+            connection.request('GET', target, headers=headers)
+            response = connection.getresponse()
+        except Exception:
+            connection.close()
+            raise
+
+        timings['ttfb'] = time.perf_counter() - start - timings['dns'] - timings['connect']
+        body_start = time.perf_counter()
+        try:
+            body = response.read()
+        except Exception:
+            connection.close()
+            raise
+        timings['body'] = time.perf_counter() - body_start
+        timings['total'] = time.perf_counter() - start
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(connection)
+
+        if response.status in (301, 302, 307, 308) and redirects:
+            # Firebase може перенаправити на інший вузол бази. Location - повна адреса
+            # запиту (шлях, параметри, токен), тому з неї береться лише вузол
+            location = urlsplit(response.getheader('Location') or '')
+            if location.hostname:
+                self._set_origin(location._replace(scheme=location.scheme or self.scheme))
+                self.close()
+            return self._request(path, params, headers, redirects - 1)
+
+        new_etag = response.getheader('ETag')
+        if response.status == 304:
+            return TransportResponse(None, new_etag, False, len(body), timings)
+
+        content = self._decode(body, response.getheader('Content-Encoding'))
+        if response.status != 200:
+            try:
+                message = json.loads(content).get('error', '')
+            except (ValueError, AttributeError):
+                message = content[:200].decode('utf-8', 'replace')
+            raise TransportError(response.status, message)
+
+        return TransportResponse(json.loads(content), new_etag, True, len(body), timings)
+
+    @staticmethod
+    def _decode(body, encoding):
+        if encoding == 'gzip':
+            return zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        if encoding == 'deflate':
+            try:
+                return zlib.decompress(body)
+            except zlib.error:
+                return zlib.decompress(body, -zlib.MAX_WBITS)
+        return body
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
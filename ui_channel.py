@@ -0,0 +1,93 @@
+import threading
+import time
+import tkinter as tk
+from collections import deque
+
+import metrics
+
+UPDATE_EVENT = '<<MonitorUpdates>>'
+
+
+class UpdateChannel:
+    """Передача змін з фонових потоків у потік Tk зі злиттям.
+
+    Для кожної папки зберігається лише останній стан, тому розмір черги
+    обмежений кількістю папок, а проміжні стани, які вікно не встигло
+    показати, відкидаються без рендерингу. Службові повідомлення (результат
+    завантаження тощо) йдуть окремою обмеженою чергою. Потік Tk будиться
+    однією віртуальною подією на пакет змін, лише коли є що показати.
+    """
+
+    def __init__(self, root, handler, max_messages=100):
+        self.root = root
+        self.handler = handler  # handler(folders, messages) у потоці Tk
+        self.coalesced = 0  # Стани папок, замінені новішими до показу
+        self.dropped = 0  # Службові повідомлення, відкинуті через переповнення
+        self.batch_since = None  # perf_counter найстарішої зміни пакета, що зараз обробляється
+        self._folders = {}
+        self._pending_since = None
+        self._messages = deque(maxlen=max_messages)
+        self._lock = threading.Lock()
+        self._wake_pending = False
+        self._ready = False
+        root.bind(UPDATE_EVENT, self._on_event, add='+')
+        # event_generate з інших потоків працює лише при запущеному mainloop
+        root.after_idle(self._attach)
+
+    def put_folders(self, updates):
+        """{папка: новий вигляд або None}; старіші неотримані стани папок замінюються"""
+        if not updates:
+            return
+        coalesced = 0
+        with self._lock:
+            if not self._folders:
+                self._pending_since = time.perf_counter()
+            for folder_name, view in updates.items():
+                if folder_name in self._folders:
+                    coalesced += 1
+                self._folders[folder_name] = view
+            self.coalesced += coalesced
+        if coalesced:
+            metrics.UI_COALESCED.inc(coalesced)
+        self._wake()
+
+    def put_message(self, action, data=None):
+        with self._lock:
+            if len(self._messages) == self._messages.maxlen:
+                self.dropped += 1
+            self._messages.append((action, data))
+        self._wake()
+
+    def _wake(self):
+        with self._lock:
+            if self._wake_pending or not self._ready:
+                return
+            self._wake_pending = True
+        try:
+            self.root.event_generate(UPDATE_EVENT, when='tail')
+        except (RuntimeError, tk.TclError):
+            # Вікно закрито або mainloop ще/вже не працює
+            with self._lock:
+                self._wake_pending = False
+
+    def _attach(self):
+        self._ready = True
+        self._deliver()
+
+    def _on_event(self, event=None):
+        self._deliver()
+
+    def _deliver(self):
+        with self._lock:
+            self._wake_pending = False
+            folders, self._folders = self._folders, {}
+            self.batch_since = self._pending_since if folders else None
+            messages = list(self._messages)
+            self._messages.clear()
+        if folders or messages:
+            self.handler(folders, messages)
+
+    def clear(self):
+        """Відкидання неотриманих змін папок (після зупинки моніторингу)"""
+        with self._lock:
+            self._folders = {}